@@ -16,6 +16,15 @@ CCACHE_CONFIG_PATH = CCACHE_CONFIG_DIR / "ccache.conf"
 
 AUTO_MAINTAIN_MARKER = "# @auto-maintain"
 
+# Sloppiness for --ccache-sloppy, chosen so worktrees can share hits:
+#   locale: ignore LANG/LC_* env vars in hash
+#   time_macros: ignore __DATE__, __TIME__, __TIMESTAMP__
+#   include_file_mtime/ctime: accept headers touched by a fresh checkout
+#   pch_defines: don't miss on -D changes that only affect a PCH
+CCACHE_SLOPPINESS = (
+    "pch_defines,time_macros,include_file_mtime,include_file_ctime,locale"
+)
+
 CCACHE_CONFIG_BODY = """\
 # ccache configuration for xahaud builds
 #
@@ -46,13 +55,17 @@ def get_ccache_env(
     base_dir: str | None = None,
     sloppy: bool = False,
     debug_logfile: str | None = None,
+    remote_storage: str | None = None,
 ) -> dict:
     """Get environment variables for ccache with custom config.
 
     Args:
         base_dir: Base directory for path normalization (enables cache sharing between worktrees)
-        sloppy: If True, ignore locale and __DATE__, __TIME__ differences
+        sloppy: If True, apply CCACHE_SLOPPINESS (locale, __DATE__/__TIME__,
+            header mtimes, PCH defines)
         debug_logfile: If provided, enable debug logging to this file
+        remote_storage: ccache remote storage URL(s), e.g.
+            "redis://host:6379" or "http://host:8080|read-only=true"
 
     Returns:
         Environment dict with ccache settings
@@ -66,14 +79,17 @@ def get_ccache_env(
         env["CCACHE_BASEDIR"] = abs_base_dir
 
     if sloppy:
-        # locale: ignore LANG/LC_* env vars in hash
-        # time_macros: ignore __DATE__, __TIME__, __TIMESTAMP__
-        env["CCACHE_SLOPPINESS"] = "locale,time_macros"
+        env["CCACHE_SLOPPINESS"] = CCACHE_SLOPPINESS
 
     if debug_logfile:
         env["CCACHE_DEBUG"] = "1"
         env["CCACHE_LOGFILE"] = debug_logfile
 
+    if remote_storage:
+        # Still read and write the local cache; remote is a second tier.
+        env["CCACHE_REMOTE_STORAGE"] = remote_storage
+        env["CCACHE_REMOTE_ONLY"] = "false"
+
     return env
 
 
@@ -209,7 +225,7 @@ def get_ccache_launcher(
         parts.append(f"CCACHE_BASEDIR={basedir}")
 
     if sloppy:
-        parts.append("CCACHE_SLOPPINESS=locale,time_macros")
+        parts.append(f"CCACHE_SLOPPINESS={CCACHE_SLOPPINESS}")
 
     if debug_logfile:
         parts.append("CCACHE_DEBUG=1")
@@ -1,8 +1,8 @@
 """CMake configuration and build utilities."""
 
+import hashlib
 import os
-from contextlib import nullcontext
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 
 from xahaud_scripts.build.ccache import (
@@ -13,9 +13,9 @@ from xahaud_scripts.build.ccache import (
     setup_ccache_config,
 )
 from xahaud_scripts.build.conan import find_conan_toolchain
+from xahaud_scripts.build.config import detect_previous_build_config
 from xahaud_scripts.utils.logging import make_logger
 from xahaud_scripts.utils.shell_utils import (
-    change_directory,
     check_tool_exists,
     get_logical_cpu_count,
     run_command,
@@ -23,6 +23,10 @@ from xahaud_scripts.utils.shell_utils import (
 
 logger = make_logger(__name__)
 
+# Source globs never worth counters in llvm-injected builds: conan-provided
+# deps (boost, openssl, ...) and system headers.
+DEFAULT_COVERAGE_EXCLUDES = ("*/.conan2/*", "*/.conan/*", "/usr/*")
+
 
 def format_command(cmd: list[str], indent: str = "  ") -> str:
     """Format a command list for nice display, one arg per line."""
@@ -49,16 +53,72 @@ class CMakeOptions:
     # the flags into a non-coverage build. If/when upstream adds a
     # native LLVM path, that gets a separate name (e.g. "llvm-native").
     coverage_impl: str = "gcov"
+    # llvm-injected only: -fprofile-list source globs. Excludes are added to
+    # DEFAULT_COVERAGE_EXCLUDES; any include makes everything else skipped,
+    # and an include wins over an exclude matching the same file.
+    coverage_include: list[str] = field(default_factory=list)
+    coverage_exclude: list[str] = field(default_factory=list)
+    # llvm-injected only: -O level. 0 keeps line mapping exact; 1 runs the
+    # instrumented tests much faster at the cost of folded/inlined lines.
+    coverage_opt_level: int = 0
     verbose: bool = False
     ubsan: bool = False
     stdlib_hardening: bool = False
     ccache: bool = False
     ccache_basedir: str | None = None  # Absolute path for cache sharing
-    ccache_sloppy: bool = False  # Ignore locale, __DATE__, __TIME__
+    ccache_sloppy: bool = False  # Apply ccache.CCACHE_SLOPPINESS
     ccache_debug: bool = False  # Enable ccache debug logging
     log_line_numbers: bool = True
     use_conan: bool = True
     unity: bool = False  # OFF for faster incremental builds during development
+    # CMake generator; None picks Ninja when it is on PATH, else CMake's default.
+    # With Ninja, leave -j unset and use CMAKE_BUILD_PARALLEL_LEVEL to override.
+    generator: str | None = None
+
+
+def write_coverage_profile_list(
+    build_dir: str,
+    include: list[str],
+    exclude: list[str],
+    dry_run: bool = False,
+) -> Path:
+    """Write the -fprofile-list file for llvm-injected coverage.
+
+    The file name carries a hash of its contents: ccache hashes the
+    compiler command line but not the list itself, so a changed list
+    must change the flag to avoid reusing stale objects.
+
+    Clang checks allow entries before skip entries, so an include glob
+    wins over any exclude glob that matches the same file.
+
+    Args:
+        build_dir: Path to the build directory
+        include: Source globs to instrument (empty means everything)
+        exclude: Extra source globs to skip on top of the defaults;
+            ignored for files that an include also matches
+        dry_run: If True, compute the path without writing
+
+    Returns:
+        Path to the profile list
+    """
+    lines = ["# Generated by x-run-tests; edit via --coverage-include/-exclude"]
+    lines.append("[clang]")
+    # Use the source: prefix; bare src: entries flip clang's default to forbid.
+    lines.extend(
+        f"source:{glob}=skip" for glob in (*DEFAULT_COVERAGE_EXCLUDES, *exclude)
+    )
+    if include:
+        lines.extend(f"source:{glob}=allow" for glob in include)
+        lines.append("default:skip")
+    else:
+        lines.append("default:allow")
+    content = "\n".join(lines) + "\n"
+
+    digest = hashlib.sha256(content.encode()).hexdigest()[:12]
+    path = Path(build_dir).resolve() / f"coverage_profile-{digest}.list"
+    if not dry_run and not path.exists():
+        path.write_text(content)
+    return path
 
 
 def cmake_configure(
@@ -79,161 +139,174 @@ def cmake_configure(
     """
     logger.info("Configuring CMake build...")
 
-    build_dir_exists = os.path.isdir(build_dir)
-    workdir = (
-        nullcontext()
-        if dry_run and not build_dir_exists
-        else change_directory(build_dir)
-    )
-
-    with workdir:
-        # Get environment variables
-        llvm_dir = os.environ.get("LLVM_DIR", "")
-        llvm_library_dir = os.environ.get("LLVM_LIBRARY_DIR", "")
-
-        # Build cmake command
-        cmake_cmd = ["cmake"]
-
-        # Add generator if ninja is available
-        if check_tool_exists("ninja"):
-            cmake_cmd.extend(["-G", "Ninja"])
-
-        # Set the build type
-        cmake_cmd.append(f"-DCMAKE_BUILD_TYPE={options.build_type}")
-
-        # Common flags
-        if options.verbose:
-            cmake_cmd.append("-DCMAKE_VERBOSE_MAKEFILE=ON")
-
-        cmake_cmd.append("-Dassert=TRUE")
-
-        if options.log_line_numbers:
-            cmake_cmd.append("-DBEAST_ENHANCED_LOGGING=ON")
-
-        # Enable compile_commands.json generation
-        cmake_cmd.append("-DCMAKE_EXPORT_COMPILE_COMMANDS=ON")
-
-        # Handle ccache - need special handling when combined with conan
-        use_ccache = False
-        ccache_debug_logfile = None
-        if options.ccache:
-            if check_tool_exists("ccache"):
-                use_ccache = True
-                setup_ccache_config(dry_run=dry_run)
-                logger.info(f"Using ccache with config from {CCACHE_CONFIG_PATH}")
-                if options.ccache_debug:
-                    ccache_debug_logfile = get_ccache_debug_logfile()
-                    logger.info(f"ccache debug logging to: {ccache_debug_logfile}")
-            else:
-                logger.warning(
-                    "ccache requested but not found in PATH, continuing without it"
-                )
-
-        injected_compile_flags: list[str] = []
-        injected_link_flags: list[str] = []
-
-        # Coverage:
-        #   gcov           → -Dcoverage=ON (rippled's native gcov path → gcovr)
-        #   llvm-injected  → CMAKE_CXX_FLAGS only; do NOT set -Dcoverage=ON
-        #                    (else clang accepts both --coverage and
-        #                    -fprofile-instr-generate, producing .gcda AND
-        #                    .profraw simultaneously). Build dir should be
-        #                    separate from the gcov build to avoid mixing.
-        if options.coverage:
-            if options.coverage_impl == "llvm-injected":
-                logger.info(
-                    "Configuring build with LLVM source-based coverage "
-                    "(injected via CMAKE_CXX_FLAGS; no -Dcoverage=ON)"
-                )
-                injected_compile_flags.extend(
-                    ["-O0", "-fcoverage-mapping", "-fprofile-instr-generate"]
-                )
-            else:
-                logger.info(
-                    "Configuring build with coverage instrumentation (gcov/gcovr)"
-                )
-                cmake_cmd.append("-Dcoverage=ON")
+    # Get environment variables
+    llvm_dir = os.environ.get("LLVM_DIR", "")
+    llvm_library_dir = os.environ.get("LLVM_LIBRARY_DIR", "")
+
+    # Build cmake command
+    cmake_cmd = ["cmake"]
+
+    # Default to Ninja if available. CMake refuses to switch the
+    # generator of an existing build dir, so keep whatever it has.
+    generator = options.generator
+    if generator is None and check_tool_exists("ninja"):
+        generator = "Ninja"
+    if generator:
+        prev_generator = detect_previous_build_config(build_dir)["generator"]
+        if prev_generator in (None, generator):
+            logger.info(f"Using the {generator} generator")
+            cmake_cmd.extend(["-G", generator])
         else:
-            logger.info(f"Configuring standard {options.build_type} build")
-
-        if options.ubsan:
-            logger.info("Configuring build with UndefinedBehaviorSanitizer")
-            injected_compile_flags.extend(
-                [
-                    "-fsanitize=undefined",
-                    "-fno-omit-frame-pointer",
-                    "-fno-sanitize-recover=undefined",
-                ]
+            logger.warning(
+                f"{build_dir} was configured with '{prev_generator}'; keeping "
+                f"it. Remove the build directory to switch to {generator}."
             )
-            injected_link_flags.append("-fsanitize=undefined")
 
-        if options.stdlib_hardening:
-            logger.info("Configuring build with standard library hardening")
-            injected_compile_flags.append(
-                "-D_LIBCPP_HARDENING_MODE=_LIBCPP_HARDENING_MODE_DEBUG"
+    # Set the build type
+    cmake_cmd.append(f"-DCMAKE_BUILD_TYPE={options.build_type}")
+
+    # Common flags
+    if options.verbose:
+        cmake_cmd.append("-DCMAKE_VERBOSE_MAKEFILE=ON")
+
+    cmake_cmd.append("-Dassert=TRUE")
+
+    if options.log_line_numbers:
+        cmake_cmd.append("-DBEAST_ENHANCED_LOGGING=ON")
+
+    # Enable compile_commands.json generation
+    cmake_cmd.append("-DCMAKE_EXPORT_COMPILE_COMMANDS=ON")
+
+    # Handle ccache - need special handling when combined with conan
+    use_ccache = False
+    ccache_debug_logfile = None
+    if options.ccache:
+        if os.environ.get("CCACHE_DISABLE"):
+            # The launcher would only add a ccache exec per compile
+            logger.warning("ccache requested but CCACHE_DISABLE is set, skipping it")
+        elif check_tool_exists("ccache"):
+            use_ccache = True
+            setup_ccache_config(dry_run=dry_run)
+            logger.info(f"Using ccache with config from {CCACHE_CONFIG_PATH}")
+            if options.ccache_debug:
+                ccache_debug_logfile = get_ccache_debug_logfile()
+                logger.info(f"ccache debug logging to: {ccache_debug_logfile}")
+        else:
+            logger.warning(
+                "ccache requested but not found in PATH, continuing without it"
             )
 
-        if injected_compile_flags:
-            flags = " ".join(injected_compile_flags)
-            cmake_cmd.extend(
-                [
-                    f"-DCMAKE_CXX_FLAGS={flags}",
-                    f"-DCMAKE_C_FLAGS={flags}",
-                ]
+    injected_compile_flags: list[str] = []
+    injected_link_flags: list[str] = []
+
+    # Coverage:
+    #   gcov           → -Dcoverage=ON (rippled's native gcov path → gcovr)
+    #   llvm-injected  → CMAKE_CXX_FLAGS only; do NOT set -Dcoverage=ON
+    #                    (else clang accepts both --coverage and
+    #                    -fprofile-instr-generate, producing .gcda AND
+    #                    .profraw simultaneously). Build dir should be
+    #                    separate from the gcov build to avoid mixing.
+    if options.coverage:
+        if options.coverage_impl == "llvm-injected":
+            logger.info(
+                "Configuring build with LLVM source-based coverage "
+                "(injected via CMAKE_CXX_FLAGS; no -Dcoverage=ON)"
             )
-
-        if injected_link_flags:
-            flags = " ".join(injected_link_flags)
-            cmake_cmd.extend(
+            profile_list = write_coverage_profile_list(
+                build_dir,
+                options.coverage_include,
+                options.coverage_exclude,
+                dry_run=dry_run,
+            )
+            injected_compile_flags.extend(
                 [
-                    f"-DCMAKE_EXE_LINKER_FLAGS={flags}",
-                    f"-DCMAKE_SHARED_LINKER_FLAGS={flags}",
+                    f"-O{options.coverage_opt_level}",
+                    "-fcoverage-mapping",
+                    "-fprofile-instr-generate",
+                    f"-fprofile-list={profile_list}",
                 ]
             )
-
-        # Add conan toolchain if using conan
-        if options.use_conan:
-            # Find the conan-generated toolchain wherever it actually landed.
-            # Layout depends on conan's --output-folder + the project's
-            # cmake_layout settings (e.g. self.folders.generators =
-            # 'build/generators' puts it under <bd>/build/generators/).
-            found = find_conan_toolchain(build_dir)
-            if found is None:
-                if dry_run:
-                    conan_toolchain_abs = str(
-                        Path(build_dir)
-                        / "build"
-                        / "generators"
-                        / "conan_toolchain.cmake"
-                    )
-                    logger.debug(
-                        "Using expected dry-run Conan toolchain path: "
-                        f"{conan_toolchain_abs}"
-                    )
-                else:
-                    logger.error(
-                        f"conan_toolchain.cmake not found anywhere under {build_dir}. "
-                        "Did `conan install` run successfully?"
-                    )
-                    return False
+        else:
+            logger.info("Configuring build with coverage instrumentation (gcov/gcovr)")
+            cmake_cmd.append("-Dcoverage=ON")
+    else:
+        logger.info(f"Configuring standard {options.build_type} build")
+
+    if options.ubsan:
+        logger.info("Configuring build with UndefinedBehaviorSanitizer")
+        injected_compile_flags.extend(
+            [
+                "-fsanitize=undefined",
+                "-fno-omit-frame-pointer",
+                "-fno-sanitize-recover=undefined",
+            ]
+        )
+        injected_link_flags.append("-fsanitize=undefined")
+
+    if options.stdlib_hardening:
+        logger.info("Configuring build with standard library hardening")
+        injected_compile_flags.append(
+            "-D_LIBCPP_HARDENING_MODE=_LIBCPP_HARDENING_MODE_DEBUG"
+        )
+
+    if injected_compile_flags:
+        flags = " ".join(injected_compile_flags)
+        cmake_cmd.extend(
+            [
+                f"-DCMAKE_CXX_FLAGS={flags}",
+                f"-DCMAKE_C_FLAGS={flags}",
+            ]
+        )
+
+    if injected_link_flags:
+        flags = " ".join(injected_link_flags)
+        cmake_cmd.extend(
+            [
+                f"-DCMAKE_EXE_LINKER_FLAGS={flags}",
+                f"-DCMAKE_SHARED_LINKER_FLAGS={flags}",
+            ]
+        )
+
+    # Add conan toolchain if using conan
+    if options.use_conan:
+        # Find the conan-generated toolchain wherever it actually landed.
+        # Layout depends on conan's --output-folder + the project's
+        # cmake_layout settings (e.g. self.folders.generators =
+        # 'build/generators' puts it under <bd>/build/generators/).
+        found = find_conan_toolchain(build_dir)
+        if found is None:
+            if dry_run:
+                conan_toolchain_abs = str(
+                    Path(build_dir) / "build" / "generators" / "conan_toolchain.cmake"
+                )
+                logger.debug(
+                    "Using expected dry-run Conan toolchain path: "
+                    f"{conan_toolchain_abs}"
+                )
             else:
-                # Use an absolute path — the wrapper sits in build_dir, so a
-                # relative-via-CMAKE_CURRENT_LIST_DIR include is fragile across
-                # different layouts. Absolute is always correct.
-                conan_toolchain_abs = str(found.resolve())
-
-            if use_ccache:
-                # Create a wrapper toolchain that includes Conan's toolchain
-                # then overlays ccache. This is needed because Conan's toolchain
-                # can override CMAKE_*_COMPILER_LAUNCHER settings.
-                # We use `env` to bake ccache config inline so it works across worktrees.
-                wrapper_path = os.path.join(build_dir, "ccache_wrapper_toolchain.cmake")
-                ccache_launcher = get_ccache_launcher(
-                    basedir=options.ccache_basedir,
-                    sloppy=options.ccache_sloppy,
-                    debug_logfile=ccache_debug_logfile,
+                logger.error(
+                    f"conan_toolchain.cmake not found anywhere under {build_dir}. "
+                    "Did `conan install` run successfully?"
                 )
-                wrapper_content = f"""# Wrapper toolchain: includes Conan toolchain then adds ccache
+                return False
+        else:
+            # Use an absolute path — the wrapper sits in build_dir, so a
+            # relative-via-CMAKE_CURRENT_LIST_DIR include is fragile across
+            # different layouts. Absolute is always correct.
+            conan_toolchain_abs = str(found.resolve())
+
+        if use_ccache:
+            # Create a wrapper toolchain that includes Conan's toolchain
+            # then overlays ccache. This is needed because Conan's toolchain
+            # can override CMAKE_*_COMPILER_LAUNCHER settings.
+            # We use `env` to bake ccache config inline so it works across worktrees.
+            wrapper_path = os.path.join(build_dir, "ccache_wrapper_toolchain.cmake")
+            ccache_launcher = get_ccache_launcher(
+                basedir=options.ccache_basedir,
+                sloppy=options.ccache_sloppy,
+                debug_logfile=ccache_debug_logfile,
+            )
+            wrapper_content = f"""# Wrapper toolchain: includes Conan toolchain then adds ccache
 # Auto-generated by run-tests
 
 # Include Conan's generated toolchain first (sets compiler, flags, etc.)
@@ -244,71 +317,71 @@ include("{conan_toolchain_abs}")
 set(CMAKE_C_COMPILER_LAUNCHER {ccache_launcher} CACHE STRING "C compiler launcher" FORCE)
 set(CMAKE_CXX_COMPILER_LAUNCHER {ccache_launcher} CACHE STRING "C++ compiler launcher" FORCE)
 """
-                if not dry_run:
-                    with open(wrapper_path, "w") as f:
-                        f.write(wrapper_content)
-                    logger.debug(f"Created ccache wrapper toolchain at {wrapper_path}")
-                else:
-                    print(f"\n[DRY RUN] Would create {wrapper_path} with content:")
-                    print(wrapper_content)
-
-                toolchain_path = "ccache_wrapper_toolchain.cmake"
+            if not dry_run:
+                with open(wrapper_path, "w") as f:
+                    f.write(wrapper_content)
+                logger.debug(f"Created ccache wrapper toolchain at {wrapper_path}")
             else:
-                toolchain_path = conan_toolchain_abs
-
-            logger.debug(f"Using toolchain at {toolchain_path}")
-            cmake_cmd.append(f"-DCMAKE_TOOLCHAIN_FILE={toolchain_path}")
-        elif use_ccache:
-            # No conan - can use ccache directly with env wrapper for config
-            ccache_launcher = get_ccache_launcher(
-                basedir=options.ccache_basedir,
-                sloppy=options.ccache_sloppy,
-                debug_logfile=ccache_debug_logfile,
-            )
-            cmake_cmd.extend(
-                [
-                    f"-DCMAKE_C_COMPILER_LAUNCHER={ccache_launcher}",
-                    f"-DCMAKE_CXX_COMPILER_LAUNCHER={ccache_launcher}",
-                ]
-            )
-
-        # Unity build setting (default OFF for faster incremental builds)
-        cmake_cmd.append(f"-Dunity={'ON' if options.unity else 'OFF'}")
-
-        # Always add xrpld flag to make rippled target available
-        logger.debug("Setting -Dxrpld=ON to enable rippled target")
-        cmake_cmd.append("-Dxrpld=ON")
-
-        # Always add tests flag
-        logger.debug("Setting -Dtests=ON to enable tests")
-        cmake_cmd.append("-Dtests=ON")
-
-        # Add LLVM settings if provided
-        if llvm_dir:
-            logger.debug(f"Using LLVM directory: {llvm_dir}")
-            cmake_cmd.append(f"-DLLVM_DIR={llvm_dir}")
-
-        if llvm_library_dir:
-            logger.debug(f"Using LLVM library directory: {llvm_library_dir}")
-            cmake_cmd.append(f"-DLLVM_LIBRARY_DIR={llvm_library_dir}")
-
-        # Add source directory (we're in build dir, source is parent)
-        cmake_cmd.append("..")
+                print(f"\n[DRY RUN] Would create {wrapper_path} with content:")
+                print(wrapper_content)
 
-        if dry_run:
-            print("\n[DRY RUN] CMake configure command:")
-            print(f"  Working directory: {build_dir}")
-            print(format_command(cmake_cmd, indent="    "))
-            print()
-            return True
-
-        try:
-            run_command(cmake_cmd, tee_file=tee_file)
-            logger.info("CMake configuration completed successfully")
-            return True
-        except Exception as e:
-            logger.error(f"CMake configuration failed: {e}")
-            return False
+            toolchain_path = "ccache_wrapper_toolchain.cmake"
+        else:
+            toolchain_path = conan_toolchain_abs
+
+        logger.debug(f"Using toolchain at {toolchain_path}")
+        cmake_cmd.append(f"-DCMAKE_TOOLCHAIN_FILE={toolchain_path}")
+    elif use_ccache:
+        # No conan - can use ccache directly with env wrapper for config
+        ccache_launcher = get_ccache_launcher(
+            basedir=options.ccache_basedir,
+            sloppy=options.ccache_sloppy,
+            debug_logfile=ccache_debug_logfile,
+        )
+        cmake_cmd.extend(
+            [
+                f"-DCMAKE_C_COMPILER_LAUNCHER={ccache_launcher}",
+                f"-DCMAKE_CXX_COMPILER_LAUNCHER={ccache_launcher}",
+            ]
+        )
+
+    # Unity build setting (default OFF for faster incremental builds)
+    cmake_cmd.append(f"-Dunity={'ON' if options.unity else 'OFF'}")
+
+    # Always add xrpld flag to make rippled target available
+    logger.debug("Setting -Dxrpld=ON to enable rippled target")
+    cmake_cmd.append("-Dxrpld=ON")
+
+    # Always add tests flag
+    logger.debug("Setting -Dtests=ON to enable tests")
+    cmake_cmd.append("-Dtests=ON")
+
+    # Add LLVM settings if provided
+    if llvm_dir:
+        logger.debug(f"Using LLVM directory: {llvm_dir}")
+        cmake_cmd.append(f"-DLLVM_DIR={llvm_dir}")
+
+    if llvm_library_dir:
+        logger.debug(f"Using LLVM library directory: {llvm_library_dir}")
+        cmake_cmd.append(f"-DLLVM_LIBRARY_DIR={llvm_library_dir}")
+
+    # Add source directory (run from the build dir, source is its parent)
+    cmake_cmd.append("..")
+
+    if dry_run:
+        print("\n[DRY RUN] CMake configure command:")
+        print(f"  Working directory: {build_dir}")
+        print(format_command(cmake_cmd, indent="    "))
+        print()
+        return True
+
+    try:
+        run_command(cmake_cmd, tee_file=tee_file, cwd=build_dir)
+        logger.info("CMake configuration completed successfully")
+        return True
+    except Exception as e:
+        logger.error(f"CMake configuration failed: {e}")
+        return False
 
 
 def cmake_build(
@@ -320,6 +393,7 @@ def cmake_build(
     ccache: bool = False,
     ccache_basedir: str | None = None,
     ccache_sloppy: bool = False,
+    ccache_remote_storage: str | None = None,
     tee_file: Path | None = None,
 ) -> bool:
     """Build the specified target.
@@ -328,78 +402,90 @@ def cmake_build(
         build_dir: Path to the build directory
         target: Build target (e.g., rippled, xrpld)
         verbose: Enable verbose build output
-        parallel: Number of parallel jobs (defaults to CPU count)
+        parallel: Number of parallel jobs. Defaults to the generator's own
+            choice for Ninja builds (or CMAKE_BUILD_PARALLEL_LEVEL if set),
+            else the CPU count
         dry_run: If True, print the command without executing
         ccache: If True, use ccache with custom config
         ccache_basedir: Base directory for ccache path normalization (enables cache sharing)
-        ccache_sloppy: If True, ignore __FILE__, __DATE__, __TIME__ differences
+        ccache_sloppy: If True, apply ccache.CCACHE_SLOPPINESS
+        ccache_remote_storage: ccache remote storage URL(s) shared across
+            machines. Set only in the build env (not baked into the launcher)
+            so credentials stay out of CMakeCache.txt
 
     Returns:
         True if successful, False otherwise
     """
     logger.info(f"Building {target}...")
 
-    if parallel is None:
-        parallel = get_logical_cpu_count()
-
-    build_dir_exists = os.path.isdir(build_dir)
-    workdir = (
-        nullcontext()
-        if dry_run and not build_dir_exists
-        else change_directory(build_dir)
-    )
-
-    with workdir:
-        build_cmd = ["cmake", "--build", "."]
-
-        # Add target
-        build_cmd.extend(["--target", target])
-
-        # Add parallel flag
+    build_cmd = ["cmake", "--build", "."]
+
+    # Add target
+    build_cmd.extend(["--target", target])
+
+    # Add parallel flag. Ninja already sizes its job pool to the
+    # machine, and cmake honours CMAKE_BUILD_PARALLEL_LEVEL by itself;
+    # only other generators (make) need an explicit count.
+    if parallel is None and (
+        "CMAKE_BUILD_PARALLEL_LEVEL" in os.environ
+        or detect_previous_build_config(build_dir)["generator"] == "Ninja"
+    ):
+        logger.debug("Leaving the job count to cmake/ninja")
+    else:
+        if parallel is None:
+            parallel = get_logical_cpu_count()
         build_cmd.extend(["--parallel", str(parallel)])
 
-        if verbose:
-            logger.debug(
-                "Build will use verbose output if configured with CMAKE_VERBOSE_MAKEFILE=ON"
-            )
-
-        # Set up environment for ccache if enabled
-        env = None
-        if ccache and check_tool_exists("ccache"):
-            env = get_ccache_env(base_dir=ccache_basedir, sloppy=ccache_sloppy)
-            logger.debug(f"Using CCACHE_CONFIGPATH={env['CCACHE_CONFIGPATH']}")
-            if ccache_basedir:
-                logger.debug(f"Using CCACHE_BASEDIR={env['CCACHE_BASEDIR']}")
-            if ccache_sloppy:
-                logger.debug(f"Using CCACHE_SLOPPINESS={env['CCACHE_SLOPPINESS']}")
-
-        if dry_run:
-            print("\n[DRY RUN] CMake build command:")
-            print(f"  Working directory: {build_dir}")
-            if env:
-                print(f"  CCACHE_CONFIGPATH={env['CCACHE_CONFIGPATH']}")
-                if "CCACHE_BASEDIR" in env:
-                    print(f"  CCACHE_BASEDIR={env['CCACHE_BASEDIR']}")
-                if "CCACHE_SLOPPINESS" in env:
-                    print(f"  CCACHE_SLOPPINESS={env['CCACHE_SLOPPINESS']}")
-            print(f"  {' '.join(build_cmd)}")
-            print()
-            return True
-
-        try:
-            run_command(build_cmd, env=env, tee_file=tee_file)
-            logger.info("Build completed successfully")
-
-            # Verify the build output exists
-            rippled_path = os.path.join(build_dir, "rippled")
+    if verbose:
+        logger.debug(
+            "Build will use verbose output if configured with CMAKE_VERBOSE_MAKEFILE=ON"
+        )
+
+    # Set up environment for ccache if enabled
+    env = None
+    if ccache and check_tool_exists("ccache"):
+        env = get_ccache_env(
+            base_dir=ccache_basedir,
+            sloppy=ccache_sloppy,
+            remote_storage=ccache_remote_storage,
+        )
+        logger.debug(f"Using CCACHE_CONFIGPATH={env['CCACHE_CONFIGPATH']}")
+        if ccache_basedir:
+            logger.debug(f"Using CCACHE_BASEDIR={env['CCACHE_BASEDIR']}")
+        if ccache_sloppy:
+            logger.debug(f"Using CCACHE_SLOPPINESS={env['CCACHE_SLOPPINESS']}")
+        if ccache_remote_storage:
+            logger.info("Using ccache remote storage from --ccache-remote-storage")
+
+    if dry_run:
+        print("\n[DRY RUN] CMake build command:")
+        print(f"  Working directory: {build_dir}")
+        if env:
+            print(f"  CCACHE_CONFIGPATH={env['CCACHE_CONFIGPATH']}")
+            if "CCACHE_BASEDIR" in env:
+                print(f"  CCACHE_BASEDIR={env['CCACHE_BASEDIR']}")
+            if "CCACHE_SLOPPINESS" in env:
+                print(f"  CCACHE_SLOPPINESS={env['CCACHE_SLOPPINESS']}")
+            if "CCACHE_REMOTE_STORAGE" in env:
+                print("  CCACHE_REMOTE_STORAGE=<set>")
+        print(f"  {' '.join(build_cmd)}")
+        print()
+        return True
+
+    try:
+        run_command(build_cmd, env=env, tee_file=tee_file, cwd=build_dir)
+        logger.info("Build completed successfully")
+
+        # Verify the build output exists
+        rippled_path = os.path.join(build_dir, "rippled")
+        if not os.path.exists(rippled_path):
+            rippled_path = os.path.join(build_dir, "rippled.exe")
             if not os.path.exists(rippled_path):
-                rippled_path = os.path.join(build_dir, "rippled.exe")
-                if not os.path.exists(rippled_path):
-                    logger.error("Could not find rippled executable after build")
-                    return False
-
-            logger.debug(f"Verified rippled executable exists at {rippled_path}")
-            return True
-        except Exception as e:
-            logger.error(f"Build failed: {e}")
-            return False
+                logger.error("Could not find rippled executable after build")
+                return False
+
+        logger.debug(f"Verified rippled executable exists at {rippled_path}")
+        return True
+    except Exception as e:
+        logger.error(f"Build failed: {e}")
+        return False
@@ -1,5 +1,6 @@
 """Conan package manager integration."""
 
+import hashlib
 import json
 import os
 import subprocess
@@ -7,13 +8,17 @@ from pathlib import Path
 
 from xahaud_scripts.utils.logging import make_logger
 from xahaud_scripts.utils.shell_utils import (
-    change_directory,
     check_tool_exists,
+    get_logical_cpu_count,
     run_command,
 )
 
 logger = make_logger(__name__)
 
+# Written into the build dir after a successful install; holds the input
+# fingerprint so an unchanged reconfigure can skip conan entirely.
+CONAN_STAMP_NAME = ".conan_install_stamp"
+
 
 def check_conan_available() -> bool:
     """Check if conan is available in PATH.
@@ -56,6 +61,46 @@ def conan_toolchain_present(build_dir: str) -> bool:
     return find_conan_toolchain(build_dir) is not None
 
 
+def get_conan_home() -> Path:
+    """Return the Conan 2 home (package cache and profiles).
+
+    Every build dir and worktree shares this cache; in CI, persist it
+    (e.g. mount a volume at this path) to keep installs warm.
+    """
+    return Path(os.environ.get("CONAN_HOME", Path.home() / ".conan2"))
+
+
+def conan_install_fingerprint(xahaud_root: str, build_type: str) -> str:
+    """Hash the inputs that decide what ``conan install`` produces.
+
+    Covers the recipe (conanfile.py/.txt), the default profile and the
+    build type. Other profile or remote changes are not tracked; use a
+    forced install for those.
+    """
+    conan_home = get_conan_home()
+    hasher = hashlib.sha256(f"build_type={build_type}\n".encode())
+    for path in (
+        Path(xahaud_root) / "conanfile.py",
+        Path(xahaud_root) / "conanfile.txt",
+        conan_home / "profiles" / "default",
+    ):
+        if path.is_file():
+            hasher.update(f"{path.name}\n".encode())
+            hasher.update(path.read_bytes())
+    return hasher.hexdigest()
+
+
+def conan_install_is_current(build_dir: str, fingerprint: str) -> bool:
+    """Return True if build_dir holds an install made from the same inputs."""
+    stamp = Path(build_dir) / CONAN_STAMP_NAME
+    try:
+        if stamp.read_text().strip() != fingerprint:
+            return False
+    except OSError:
+        return False
+    return conan_toolchain_present(build_dir)
+
+
 def _pick_date_tz_option(graph: dict) -> list[str]:
     """Return the ``-o`` override that forces the ``date`` dep onto the OS tz db.
 
@@ -122,6 +167,7 @@ def conan_install(
     build_type: str = "Debug",
     build_dir: str | None = None,
     dry_run: bool = False,
+    force: bool = False,
 ) -> bool:
     """Install dependencies using Conan into the given build dir.
 
@@ -137,6 +183,8 @@ def conan_install(
         build_type: CMake build type (Debug or Release).
         build_dir: Build directory to scope the conan output to.
         dry_run: If True, print the command without executing.
+        force: If True, install even if the build dir's stamp says the
+            recipe, profile and build type are unchanged.
 
     Returns:
         True if successful, False otherwise.
@@ -144,8 +192,18 @@ def conan_install(
     if not check_conan_available():
         return False
 
+    fingerprint = None
+    if build_dir is not None and not dry_run:
+        fingerprint = conan_install_fingerprint(xahaud_root, build_type)
+        if not force and conan_install_is_current(build_dir, fingerprint):
+            logger.info(
+                "Conan inputs unchanged since the last install, skipping "
+                "conan install (use --force-conan to override)"
+            )
+            return True
+
     logger.info("Installing dependencies with Conan...")
-    logger.info(f"Using build type {build_type}")
+    logger.info(f"Using build type {build_type}, CONAN_HOME={get_conan_home()}")
 
     if build_dir is not None:
         # Scope conan's output to this exact build dir so generators land
@@ -172,6 +230,15 @@ def conan_install(
         ]
         cwd = xahaud_root
 
+    # Fetch packages concurrently and never stop to prompt (conan 2 has no
+    # -j; download parallelism is a conf). Inserted before the positionals.
+    cmd[2:2] = [
+        "-c",
+        f"core.download:parallel={get_logical_cpu_count()}",
+        "-c",
+        "core:non_interactive=True",
+    ]
+
     if dry_run:
         print("\n[DRY RUN] Conan install command:")
         print(f"  Working directory: {cwd}")
@@ -194,11 +261,12 @@ def conan_install(
     if build_dir is not None:
         os.makedirs(build_dir, exist_ok=True)
 
-    with change_directory(cwd):
-        try:
-            run_command(cmd)
-            logger.info("Conan dependencies installed successfully")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to install dependencies with Conan: {e}")
-            return False
+    try:
+        run_command(cmd, cwd=cwd)
+        logger.info("Conan dependencies installed successfully")
+        if build_dir is not None and fingerprint is not None:
+            (Path(build_dir) / CONAN_STAMP_NAME).write_text(fingerprint + "\n")
+        return True
+    except Exception as e:
+        logger.error(f"Failed to install dependencies with Conan: {e}")
+        return False
@@ -32,9 +32,9 @@ def detect_previous_build_config(build_dir: str) -> dict:
 
     Returns:
         dict with keys: coverage, conan, verbose, ccache, ubsan,
-        stdlib_hardening, build_type
+        stdlib_hardening, build_type, generator (None if unknown)
     """
-    config = {
+    config: dict = {
         "coverage": False,
         "conan": False,
         "verbose": False,
@@ -42,6 +42,7 @@ def detect_previous_build_config(build_dir: str) -> dict:
         "ubsan": False,
         "stdlib_hardening": False,
         "build_type": "Debug",
+        "generator": None,
     }
 
     cmake_cache_path = os.path.join(build_dir, "CMakeCache.txt")
@@ -51,52 +52,44 @@ def detect_previous_build_config(build_dir: str) -> dict:
 
     logger.debug(f"Analyzing previous build configuration from {cmake_cache_path}")
     try:
+        # One pass over the cache, one line at a time. The conan and ccache
+        # checks need two markers each, which may sit on different lines.
+        seen_toolchain_file = seen_conan_toolchain = False
+        seen_launcher = seen_ccache = False
+        build_type = None
         with open(cmake_cache_path) as f:
-            cache_content = f.read()
-
-            # Check for coverage
-            if "coverage:STRING=ON" in cache_content:
-                config["coverage"] = True
-                logger.debug("Detected previous build with coverage enabled")
-
-            # Check for conan toolchain
-            if (
-                "CMAKE_TOOLCHAIN_FILE" in cache_content
-                and "conan_toolchain.cmake" in cache_content
-            ):
-                config["conan"] = True
-                logger.debug("Detected previous build with conan")
-
-            # Check for verbose
-            if "CMAKE_VERBOSE_MAKEFILE:BOOL=ON" in cache_content:
-                config["verbose"] = True
-                logger.debug("Detected previous build with verbose output")
-
-            # Check for ccache
-            if (
-                "CMAKE_CXX_COMPILER_LAUNCHER" in cache_content
-                and "ccache" in cache_content
-            ):
-                config["ccache"] = True
-                logger.debug("Detected previous build with ccache")
-
-            # Check for UBSan
-            if "-fsanitize=undefined" in cache_content:
-                config["ubsan"] = True
-                logger.debug("Detected previous build with UndefinedBehaviorSanitizer")
-
-            # Check for standard library hardening
-            if "_LIBCPP_HARDENING_MODE=" in cache_content:
-                config["stdlib_hardening"] = True
-                logger.debug("Detected previous build with standard library hardening")
-
-            # Check for build type
-            if "CMAKE_BUILD_TYPE:STRING=Release" in cache_content:
-                config["build_type"] = "Release"
-                logger.debug("Detected previous build with Release build type")
-            elif "CMAKE_BUILD_TYPE:STRING=Debug" in cache_content:
-                config["build_type"] = "Debug"
-                logger.debug("Detected previous build with Debug build type")
+            for line in f:
+                if "coverage:STRING=ON" in line:
+                    config["coverage"] = True
+                if "CMAKE_VERBOSE_MAKEFILE:BOOL=ON" in line:
+                    config["verbose"] = True
+                if "-fsanitize=undefined" in line:
+                    config["ubsan"] = True
+                if "_LIBCPP_HARDENING_MODE=" in line:
+                    config["stdlib_hardening"] = True
+                seen_toolchain_file |= "CMAKE_TOOLCHAIN_FILE" in line
+                seen_conan_toolchain |= "conan_toolchain.cmake" in line
+                seen_launcher |= "CMAKE_CXX_COMPILER_LAUNCHER" in line
+                seen_ccache |= "ccache" in line
+                if line.startswith("CMAKE_BUILD_TYPE:STRING="):
+                    build_type = line.partition("=")[2].strip()
+                elif (
+                    line.startswith("CMAKE_GENERATOR:INTERNAL=")
+                    and config["generator"] is None
+                ):
+                    config["generator"] = line.partition("=")[2].rstrip("\n")
+
+        config["conan"] = seen_toolchain_file and seen_conan_toolchain
+        config["ccache"] = seen_launcher and seen_ccache
+        if build_type in ("Release", "Debug"):
+            config["build_type"] = build_type
+
+        flags = ("coverage", "conan", "verbose", "ccache", "ubsan", "stdlib_hardening")
+        detected = [key for key in flags if config[key]]
+        logger.debug(
+            f"Detected previous build: {config['build_type']}, "
+            f"generator={config['generator']}, with {detected or 'no extras'}"
+        )
     except Exception as e:
         logger.warning(f"Could not analyze previous build configuration: {e}")
 
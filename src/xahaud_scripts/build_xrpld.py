@@ -5,18 +5,23 @@ from __future__ import annotations
 
 import importlib.resources
 import json
+import linecache
 import multiprocessing
 import os
 import re
 import shutil
 import subprocess
 import sys
+from array import array
 from pathlib import Path
 
 import click
-from rich.console import Console
+from rich.console import Console, Group, RenderableType
 from rich.panel import Panel
 from rich.syntax import Syntax
+from rich.text import Text
+
+from xahaud_scripts.build.ccache import CCACHE_SLOPPINESS
 
 console = Console()
 VERBOSE = False
@@ -128,10 +133,13 @@ def _apply_patches(root: Path) -> None:
                 console.print(f"  [dim]{line.strip()}[/dim]")
 
 
-def parse_diff_hunks(commitish: str, root: Path) -> dict[str, list[tuple[int, int]]]:
+def parse_diff_hunks(
+    commitish: str, root: Path
+) -> dict[str, tuple[array[int], array[int]]]:
     """Parse git diff --unified=0 to get changed line ranges per file.
 
-    Returns {filepath: [(start, end), ...]} where start/end are 1-indexed inclusive.
+    Returns {filepath: (starts, ends)} — parallel int arrays where each
+    start/end pair is a 1-indexed inclusive range. Iterate with zip().
     """
     result = subprocess.run(
         ["git", "diff", "--unified=0", "--diff-filter=ACMR", commitish],
@@ -143,7 +151,7 @@ def parse_diff_hunks(commitish: str, root: Path) -> dict[str, list[tuple[int, in
         console.print(f"[bold red]git diff failed: {result.stderr.strip()}[/bold red]")
         sys.exit(1)
 
-    files: dict[str, list[tuple[int, int]]] = {}
+    files: dict[str, tuple[array[int], array[int]]] = {}
     current_file = None
 
     for line in result.stdout.splitlines():
@@ -157,9 +165,11 @@ def parse_diff_hunks(commitish: str, root: Path) -> dict[str, list[tuple[int, in
                 count = int(m.group(2)) if m.group(2) else 1
                 if count > 0:
                     debug(f"  hunk: L{start}-{start + count - 1} ({count} lines)")
-                    files.setdefault(current_file, []).append(
-                        (start, start + count - 1)
+                    starts, ends = files.setdefault(
+                        current_file, (array("i"), array("i"))
                     )
+                    starts.append(start)
+                    ends.append(start + count - 1)
 
     debug(f"parsed {len(files)} files from diff")
     return files
@@ -183,13 +193,18 @@ def show_uncovered_diff(commitish: str, gcovr_json_path: Path, root: Path) -> No
 
     hunks = parse_diff_hunks(commitish, root)
 
-    with open(gcovr_json_path) as f:
-        cov_data = json.load(f)
+    cov_data: dict = {}
+    if hunks:
+        with open(gcovr_json_path) as f:
+            cov_data = json.load(f)
 
-    # Build coverage lookup: {filepath: {line_no: hit_count}}
+    # Build coverage lookup: {filepath: {line_no: hit_count}}, only for files
+    # in the diff — the report covers the whole tree, the diff a handful
     cov_by_file: dict[str, dict[int, int]] = {}
     for file_entry in cov_data.get("files", []):
         fname = file_entry["file"]
+        if fname not in hunks:
+            continue
         line_hits: dict[int, int] = {}
         for line in file_entry.get("lines", []):
             line_hits[line["line_number"]] = line["count"]
@@ -209,7 +224,7 @@ def show_uncovered_diff(commitish: str, gcovr_json_path: Path, root: Path) -> No
 
     console.rule(f"[bold blue]Uncovered Diff Lines (since {commitish})")
 
-    for filepath, ranges in sorted(hunks.items()):
+    for filepath, (starts, ends) in sorted(hunks.items()):
         # Skip test files and non-source
         if not filepath.endswith(SOURCE_EXTS):
             debug(f"  skip (not source): {filepath}")
@@ -226,14 +241,15 @@ def show_uncovered_diff(commitish: str, gcovr_json_path: Path, root: Path) -> No
         else:
             debug(
                 f"  {filepath}: {len(line_cov)} executable lines in coverage, "
-                f"{len(ranges)} diff hunks"
+                f"{len(starts)} diff hunks"
             )
 
         uncovered_ranges: list[tuple[int, int]] = []
+        uncovered_set: set[int] = set()  # for highlighting
         file_changed = 0
         file_covered = 0
 
-        for start, end in ranges:
+        for start, end in zip(starts, ends, strict=True):
             run_start = None
             for lineno in range(start, end + 1):
                 hits = line_cov.get(lineno)
@@ -251,6 +267,7 @@ def show_uncovered_diff(commitish: str, gcovr_json_path: Path, root: Path) -> No
                         uncovered_ranges.append((run_start, lineno - 1))
                         run_start = None
                 else:
+                    uncovered_set.add(lineno)
                     if run_start is None:
                         run_start = lineno
             if run_start is not None:
@@ -279,35 +296,32 @@ def show_uncovered_diff(commitish: str, gcovr_json_path: Path, root: Path) -> No
                 f"[yellow]{pct:.0f}%[/yellow])"
             )
 
-            # Read source file for code display
-            src_path = root / filepath
-            src_lines: list[str] = []
-            if src_path.exists():
-                src_lines = src_path.read_text().splitlines()
-
-            # Collect all uncovered line numbers for highlighting
-            uncovered_set: set[int] = set()
-            for s, e in uncovered_ranges:
-                uncovered_set.update(range(s, e + 1))
+            # Read source file for code display (linecache keeps one shared
+            # list per path; missing files come back as [])
+            src_lines = linecache.getlines(str(root / filepath))
 
+            # Render all of a file's snippets as one Group so Rich lays out
+            # once per file rather than once per panel
+            panels: list[RenderableType] = []
             for s, e in merged:
                 label = f"L{s}" if s == e else f"L{s}-{e}"
                 if src_lines:
                     ctx_start = max(1, s - 1)
                     ctx_end = min(len(src_lines), e + 1)
-                    snippet = "\n".join(src_lines[ctx_start - 1 : ctx_end])
-                    ext = Path(filepath).suffix.lstrip(".")
-                    lang = {"cpp": "cpp", "h": "cpp", "ipp": "cpp"}.get(ext, "text")
+                    snippet = "".join(src_lines[ctx_start - 1 : ctx_end]).removesuffix(
+                        "\n"
+                    )
                     syn = Syntax(
                         snippet,
-                        lang,
+                        "cpp",  # SOURCE_EXTS filter leaves only C/C++ files
                         line_numbers=True,
                         start_line=ctx_start,
                         highlight_lines=uncovered_set
                         & set(range(ctx_start, ctx_end + 1)),
                         theme="monokai",
+                        dedent=False,
                     )
-                    console.print(
+                    panels.append(
                         Panel(
                             syn,
                             title=f"[red]{label}[/red]",
@@ -316,7 +330,8 @@ def show_uncovered_diff(commitish: str, gcovr_json_path: Path, root: Path) -> No
                         )
                     )
                 else:
-                    console.print(f"  [red]{label}[/red]: uncovered")
+                    panels.append(Text.from_markup(f"  [red]{label}[/red]: uncovered"))
+            console.print(Group(*panels))
 
     debug(
         f"summary: {total_diff_files} diff files, {skipped_files} skipped, "
@@ -375,6 +390,37 @@ def _check_stale_cmake_caches(build_path: Path, cmake_defines: tuple[str, ...])
             cache_file.unlink()
 
 
+TOOLCHAIN_CACHE_NAME = ".xrpld_toolchain_cache"
+
+
+def _find_toolchain_file(build_path: Path) -> Path | None:
+    """Find conan_toolchain.cmake in the build tree.
+
+    The location is stable per build dir, so the first rglob result is
+    remembered in build_path/.xrpld_toolchain_cache and revalidated with a
+    single stat on later runs instead of walking the whole tree again.
+    """
+    cache_file = build_path / TOOLCHAIN_CACHE_NAME
+    try:
+        cached = Path(cache_file.read_text().strip())
+    except OSError:
+        cached = None
+    if cached and cached.name == "conan_toolchain.cmake" and cached.is_file():
+        debug(f"Found toolchain (cached): {cached}")
+        return cached
+
+    toolchain_matches = sorted(build_path.rglob("conan_toolchain.cmake"))
+    if not toolchain_matches:
+        return None
+    toolchain_file = toolchain_matches[0]
+    debug(f"Found toolchain: {toolchain_file}")
+    try:
+        cache_file.write_text(str(toolchain_file))
+    except OSError as e:
+        debug(f"Could not write toolchain cache {cache_file}: {e}")
+    return toolchain_file
+
+
 def _find_gtest_binary(build_path: Path, target: str, build_type: str) -> Path:
     """Find a gtest binary in the build tree.
 
@@ -815,10 +861,8 @@ def main(
         )
     else:
         # Manual approach — find toolchain file if conan was run previously
-        toolchain_matches = sorted(build_path.rglob("conan_toolchain.cmake"))
-        if toolchain_matches:
-            toolchain_file = toolchain_matches[0]
-            debug(f"Found toolchain: {toolchain_file}")
+        toolchain_file = _find_toolchain_file(build_path)
+        if toolchain_file:
             cmake_args.append(f"-DCMAKE_TOOLCHAIN_FILE={toolchain_file}")
         else:
             console.print(
@@ -862,7 +906,21 @@ def main(
     for t in cmake_targets:
         build_cmd += ["--target", t]
     build_cmd += ["--parallel", str(jobs)]
-    run_cmd(build_cmd, cwd=root)
+    # Native tool args: -l keeps ninja/make from piling new jobs on top of a
+    # machine already saturated by the (memory-heavy) xrpld link steps.
+    build_cmd += ["--", f"-j{jobs}", f"-l{jobs}"]
+    build_env = {"NINJA_STATUS": "[%f/%t %o/s] "}
+    if ccache:
+        # Normalise absolute paths against the repo root and ignore
+        # mtime/macro noise so dirty-worktree rebuilds hit in direct mode.
+        build_env["CCACHE_BASEDIR"] = str(root)
+        build_env["CCACHE_SLOPPINESS"] = CCACHE_SLOPPINESS
+    # Anything already exported by the user wins over these defaults
+    run_cmd(
+        build_cmd,
+        cwd=root,
+        env={k: v for k, v in build_env.items() if k not in os.environ},
+    )
 
     # ── Verify .gcno files exist for coverage ──
     # Each .gcda (runtime) needs a matching .gcno (compile-time) for gcovr.
@@ -5,6 +5,7 @@ import os
 import shutil
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from xahaud_scripts.utils.logging import make_logger, setup_logging
@@ -15,36 +16,86 @@ logger = make_logger(__name__)
 
 SEARCH_DIRS = ["Builds/CMake", "src", "."]
 
+# ruff and cmake-format come from the same environment as this interpreter
+_VENV_BIN = Path(sys.executable).parent
+_RUFF = _VENV_BIN / "ruff"
+_CMAKE_FORMAT = _VENV_BIN / "cmake-format"
+
+
+# File type by extension, plus whole-name matches (CMakeLists.txt)
+_TYPE_BY_EXT = {
+    ".h": "cpp",
+    ".cpp": "cpp",
+    ".sh": "shell",
+    ".py": "python",
+    ".cmake": "cmake",
+}
+_TYPE_BY_NAME = {"CMakeLists.txt": "cmake"}
+
+# Directories never worth descending into
+_PRUNE_DIRS = {".git", "__pycache__"}
+
+
+def _file_type(filename: str) -> str | None:
+    """Classify a file name as a formatter type, or None if unformatted."""
+    name = os.path.basename(filename)
+    return _TYPE_BY_NAME.get(name) or _TYPE_BY_EXT.get(os.path.splitext(name)[1])
+
 
 def get_all_files_by_type(root_dir: Path) -> dict[str, list[Path]]:
-    """Get all files by type under configured search directories."""
-    files: dict[str, list[Path]] = {"cpp": [], "shell": [], "python": [], "cmake": []}
+    """Get all files by type under configured search directories.
 
-    # File patterns by type
-    patterns = {
-        "cpp": [".h", ".cpp"],
-        "shell": [".sh"],
-        "python": [".py"],
-        "cmake": ["CMakeLists.txt", ".cmake"],
-    }
+    Each directory is walked once and every entry classified by extension,
+    rather than globbing the tree separately per pattern.
+    """
+    files: dict[str, list[Path]] = {"cpp": [], "shell": [], "python": [], "cmake": []}
 
     for subdir in SEARCH_DIRS:
         dir_path = root_dir / subdir
         if not dir_path.exists():
             continue
 
-        # Find files of each type
-        for file_type, extensions in patterns.items():
-            for ext in extensions:
-                if subdir == ".":
-                    # Special case for root directory - don't recurse
-                    files[file_type].extend(dir_path.glob(f"*{ext}"))
-                else:
-                    files[file_type].extend(dir_path.rglob(f"*{ext}"))
+        for dirpath, dirnames, filenames in os.walk(dir_path):
+            dirnames[:] = [d for d in dirnames if d not in _PRUNE_DIRS]
+            if subdir == ".":
+                # Special case for root directory - don't recurse
+                dirnames.clear()
+            for name in filenames:
+                file_type = _file_type(name)
+                if file_type:
+                    files[file_type].append(Path(dirpath) / name)
+
+    return files
+
+
+def _parse_porcelain_z(output: bytes) -> set[str]:
+    """Parse ``git status --porcelain=v1 -z`` output into a set of paths.
 
+    Each entry is ``XY PATH``; renames/copies are followed by an extra
+    NUL-terminated entry holding the original path, which is skipped.
+    Entries deleted in the index or work tree are dropped, so every
+    returned path exists. Paths are decoded with os.fsdecode so
+    undecodable bytes round-trip.
+    """
+    files: set[str] = set()
+    entries = iter(output.split(b"\0"))
+    for entry in entries:
+        if len(entry) < 4:
+            continue
+        status, path = entry[:2], entry[3:]
+        if b"R" in status or b"C" in status:
+            next(entries, None)  # original path of a rename/copy
+        if b"D" in status:
+            continue
+        files.add(os.fsdecode(path))
     return files
 
 
+def _parse_name_only_z(output: bytes) -> set[str]:
+    """Parse ``git diff --name-only -z`` output into a set of paths."""
+    return {os.fsdecode(name) for name in output.split(b"\0") if name}
+
+
 def get_git_dirty_files(
     root_dir: Path, since_base: str | None = None
 ) -> dict[str, list[Path]]:
@@ -54,48 +105,36 @@ def get_git_dirty_files(
         root_dir: The root directory of the git repository
         since_base: If provided, get files changed since this base ref (e.g., origin/dev)
     """
-    os.chdir(root_dir)
-
     files: set[str] = set()
 
     if since_base:
         # Get files changed since the base ref
         result = subprocess.run(
-            ["git", "diff", "--name-only", f"{since_base}...HEAD"],
+            [
+                "git",
+                "diff",
+                "--name-only",
+                "-z",
+                "--diff-filter=ACMR",  # no deleted paths
+                f"{since_base}...HEAD",
+            ],
+            cwd=root_dir,
             capture_output=True,
-            text=True,
             check=True,
         )
-        if result.stdout.strip():
-            files.update(result.stdout.strip().split("\n"))
+        files.update(_parse_name_only_z(result.stdout))
         logger.debug(f"Found {len(files)} files changed since {since_base}")
     else:
-        # Get staged files
+        # Staged, unstaged and untracked in one process. --untracked-files=all
+        # lists files inside new directories (like ls-files --others), rather
+        # than collapsing them to "dir/".
         result = subprocess.run(
-            ["git", "diff", "--cached", "--name-only"],
+            ["git", "status", "--porcelain=v1", "-z", "--untracked-files=all"],
+            cwd=root_dir,
             capture_output=True,
-            text=True,
             check=True,
         )
-        if result.stdout.strip():
-            files.update(result.stdout.strip().split("\n"))
-
-        # Get unstaged files
-        result = subprocess.run(
-            ["git", "diff", "--name-only"], capture_output=True, text=True, check=True
-        )
-        if result.stdout.strip():
-            files.update(result.stdout.strip().split("\n"))
-
-        # Get untracked files
-        result = subprocess.run(
-            ["git", "ls-files", "--others", "--exclude-standard"],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-        if result.stdout.strip():
-            files.update(result.stdout.strip().split("\n"))
+        files.update(_parse_porcelain_z(result.stdout))
 
     # Filter files by type
     filtered_files: dict[str, list[Path]] = {
@@ -105,123 +144,126 @@ def get_git_dirty_files(
         "cmake": [],
     }
 
-    search_dirs = []
-    for d in SEARCH_DIRS:
-        if d == ".":
-            search_dirs.append("")  # Root files have no prefix
-        else:
-            search_dirs.append(f"{d}/")
+    # Subdirectory prefixes in one tuple (str.startswith checks them in C);
+    # "." means files directly in the root
+    prefixes = tuple(f"{d}/" for d in SEARCH_DIRS if d != ".")
+    include_root = "." in SEARCH_DIRS
 
+    # Porcelain status already drops deleted paths. The since_base diff only
+    # filters deletions against the merge base, so a file changed on the
+    # branch but since removed from the work tree still needs a stat.
     for filename in files:
         file_path = root_dir / filename
-        if not file_path.exists():
-            continue
 
         # Check if file is in one of our target directories
-        is_in_target_dir = False
-        for search_dir in search_dirs:
-            if search_dir == "":  # Root directory case
-                # File is in root if it doesn't contain any path separators
-                if "/" not in filename:
-                    is_in_target_dir = True
-                    break
-            else:
-                if filename.startswith(search_dir):
-                    is_in_target_dir = True
-                    break
-
-        if not is_in_target_dir:
+        if not (
+            filename.startswith(prefixes) or (include_root and "/" not in filename)
+        ):
             continue
 
-        # Categorize by file type
-        if filename.endswith(".h") or filename.endswith(".cpp"):
-            filtered_files["cpp"].append(file_path)
-        elif filename.endswith(".sh"):
-            filtered_files["shell"].append(file_path)
-        elif filename.endswith(".py"):
-            filtered_files["python"].append(file_path)
-        elif filename.endswith("CMakeLists.txt") or filename.endswith(".cmake"):
-            filtered_files["cmake"].append(file_path)
+        file_type = _file_type(filename)
+        if file_type and (not since_base or file_path.exists()):
+            filtered_files[file_type].append(file_path)
 
     return filtered_files
 
 
-def format_cpp_file(file_path: Path, root_dir: Path) -> bool:
-    """Format a C++ file using clang-format (via mise)."""
+def _arg_chunks(paths: list[Path], reserved: int) -> list[list[Path]]:
+    """Split paths into argv-sized chunks so a batch never exceeds ARG_MAX.
+
+    ``reserved`` is the byte length of the fixed command prefix. Half of
+    ARG_MAX is used as the budget to leave room for the environment.
+    """
     try:
-        cf_cmd = get_mise_tool_cmd("clang-format")
-        subprocess.run([*cf_cmd, "-i", str(file_path)], check=True)
-        return True
-    except subprocess.CalledProcessError as e:
-        logger.error(f"Error formatting {file_path}: {e}")
-        return False
-    except FileNotFoundError:
-        logger.error("clang-format not found. Please install it first.")
-        sys.exit(1)
+        budget = os.sysconf("SC_ARG_MAX") // 2
+    except (AttributeError, ValueError, OSError):
+        budget = 128 * 1024
+    budget -= reserved
+
+    chunks: list[list[Path]] = []
+    current: list[Path] = []
+    size = 0
+    for path in paths:
+        cost = len(os.fsencode(path)) + 1 + 8  # NUL + argv pointer
+        if current and size + cost > budget:
+            chunks.append(current)
+            current, size = [], 0
+        current.append(path)
+        size += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _run_batched(cmd: list[str], paths: list[Path], root_dir: Path) -> set[Path]:
+    """Run a formatter once per argv-sized chunk of paths.
+
+    A chunk that fails (e.g. ruff on a file with a syntax error) is rerun
+    one file at a time, so only the offending files are reported. Runs from
+    root_dir so mise resolves the repo's pinned tool versions.
+
+    Returns:
+        The paths the formatter failed on.
+    """
+    reserved = sum(len(os.fsencode(arg)) + 1 + 8 for arg in cmd)
+    failed: set[Path] = set()
+    for chunk in _arg_chunks(paths, reserved):
+        try:
+            subprocess.run([*cmd, *map(str, chunk)], cwd=root_dir, check=True)
+            continue
+        except subprocess.CalledProcessError as e:
+            if len(chunk) == 1:
+                logger.error(f"Error formatting {chunk[0]}: {e}")
+                failed.update(chunk)
+                continue
+            logger.warning(
+                f"Formatting {len(chunk)} files failed ({e}); retrying one by one"
+            )
+        for path in chunk:
+            try:
+                subprocess.run([*cmd, str(path)], cwd=root_dir, check=True)
+            except subprocess.CalledProcessError as e:
+                logger.error(f"Error formatting {path}: {e}")
+                failed.add(path)
+    return failed
 
 
-def format_shell_file(file_path: Path, root_dir: Path) -> bool:
-    """Format a shell file using shfmt."""
-    try:
-        # Use shfmt with sensible defaults
-        # -i 2: indent with 2 spaces
-        # -w: write to file instead of stdout
-        subprocess.run(["shfmt", "-i", "2", "-w", str(file_path)], check=True)
-        return True
-    except subprocess.CalledProcessError as e:
-        logger.error(f"Error formatting {file_path}: {e}")
-        return False
-    except FileNotFoundError:
-        logger.error("shfmt not found. Please install it first.")
-        logger.error(
-            "Install with: brew install shfmt (macOS) or apt-get install shfmt (Linux)"
-        )
-        sys.exit(1)
+def format_cpp_files(paths: list[Path], root_dir: Path) -> set[Path]:
+    """Format C++ files in place using clang-format (via mise)."""
+    return _run_batched([*get_mise_tool_cmd("clang-format"), "-i"], paths, root_dir)
 
 
-def format_python_file(file_path: Path, root_dir: Path) -> bool:
-    """Format a Python file using ruff."""
-    ruff_path = Path(sys.executable).parent / "ruff"
+def format_shell_files(paths: list[Path], root_dir: Path) -> set[Path]:
+    """Format shell files in place using shfmt."""
+    # Use shfmt with sensible defaults
+    # -i 2: indent with 2 spaces
+    # -w: write to file instead of stdout
+    return _run_batched(["shfmt", "-i", "2", "-w"], paths, root_dir)
 
-    if not ruff_path.exists():
-        logger.error(f"ruff not found at {ruff_path}")
-        logger.error("Make sure ruff is installed in the current Python environment")
-        sys.exit(1)
 
-    try:
-        subprocess.run([str(ruff_path), "format", str(file_path)], check=True)
-        return True
-    except subprocess.CalledProcessError as e:
-        logger.error(f"Error formatting {file_path}: {e}")
-        return False
+def format_python_files(paths: list[Path], root_dir: Path) -> set[Path]:
+    """Format Python files in place using ruff."""
+    return _run_batched([str(_RUFF), "format"], paths, root_dir)
+
 
+def format_cmake_files(paths: list[Path], root_dir: Path) -> set[Path]:
+    """Format CMake files in place using cmake-format from the virtual environment."""
+    # Use cmake-format with default settings
+    return _run_batched([str(_CMAKE_FORMAT), "-i"], paths, root_dir)
 
-def format_cmake_file(file_path: Path, root_dir: Path) -> bool:
-    """Format a CMake file using cmake-format from the virtual environment."""
-    # Use cmake-format from the same environment as the current Python executable
-    cmake_format_path = Path(sys.executable).parent / "cmake-format"
 
-    # Check if cmake-format exists next to the Python executable
-    if not cmake_format_path.exists():
-        logger.error(f"cmake-format not found at {cmake_format_path}")
+def _check_venv_tool(tool_path: Path) -> None:
+    """Exit with an error if a formatter is missing from the Python environment."""
+    if not tool_path.exists():
+        logger.error(f"{tool_path.name} not found at {tool_path}")
         logger.error(
-            "Make sure cmake-format is installed in the current Python environment"
+            f"Make sure {tool_path.name} is installed in the current Python environment"
         )
         sys.exit(1)
 
-    try:
-        # Use cmake-format with default settings
-        subprocess.run([str(cmake_format_path), "-i", str(file_path)], check=True)
-        return True
-    except subprocess.CalledProcessError as e:
-        logger.error(f"Error formatting {file_path}: {e}")
-        return False
-
 
 def _resolve_tool_paths() -> str:
     """Resolve formatter binary paths for --help display."""
-    venv_bin = Path(sys.executable).parent
-
     tools: list[tuple[str, str]] = []
 
     # clang-format (C++) — via mise or bare
@@ -240,15 +282,14 @@ def _resolve_tool_paths() -> str:
     tools.append(("shfmt (shell)", shutil.which("shfmt") or "not found"))
 
     # ruff (python)
-    ruff_path = venv_bin / "ruff"
-    tools.append(
-        ("ruff (python)", str(ruff_path) if ruff_path.exists() else "not found")
-    )
+    tools.append(("ruff (python)", str(_RUFF) if _RUFF.exists() else "not found"))
 
     # cmake-format (cmake)
-    cmf_path = venv_bin / "cmake-format"
     tools.append(
-        ("cmake-format (cmake)", str(cmf_path) if cmf_path.exists() else "not found")
+        (
+            "cmake-format (cmake)",
+            str(_CMAKE_FORMAT) if _CMAKE_FORMAT.exists() else "not found",
+        )
     )
 
     width = max(len(name) for name, _ in tools)
@@ -346,25 +387,12 @@ def main() -> None:
                 logger.info("No dirty files to format")
             return
 
-    # Set up formatters by file type
-    # All formatters now need the root_dir for relative path logging
-    def cpp_formatter(path: Path) -> bool:
-        return format_cpp_file(path, root_dir)
-
-    def shell_formatter(path: Path) -> bool:
-        return format_shell_file(path, root_dir)
-
-    def python_formatter(path: Path) -> bool:
-        return format_python_file(path, root_dir)
-
-    def cmake_formatter(path: Path) -> bool:
-        return format_cmake_file(path, root_dir)
-
+    # One formatter invocation per file type (batched over all its files)
     formatters = {
-        "cpp": cpp_formatter,
-        "shell": shell_formatter,
-        "python": python_formatter,
-        "cmake": cmake_formatter,
+        "cpp": format_cpp_files,
+        "shell": format_shell_files,
+        "python": format_python_files,
+        "cmake": format_cmake_files,
     }
 
     # Track overall success
@@ -373,28 +401,54 @@ def main() -> None:
     files_changed = 0
     formatted_paths: list[Path] = []  # All successfully formatted files
 
-    # Format all requested file types
-    for file_type, formatter in formatters.items():
-        # Skip if this file type is not requested
-        if (
-            (file_type == "cpp" and not format_cpp)
-            or (file_type == "shell" and not format_shell)
-            or (file_type == "python" and not format_python)
-            or (file_type == "cmake" and not format_cmake)
-        ):
-            continue
+    # Select the requested file types that have something to format
+    requested = {
+        "cpp": format_cpp,
+        "shell": format_shell,
+        "python": format_python,
+        "cmake": format_cmake,
+    }
+    jobs = {
+        file_type: files_by_type[file_type]
+        for file_type in formatters
+        if requested[file_type] and files_by_type[file_type]
+    }
+    before = {path: path.read_bytes() for paths in jobs.values() for path in paths}
 
-        for file_path in files_by_type[file_type]:
-            rel = file_path.relative_to(root_dir)
-            before = file_path.read_bytes()
-            if not formatter(file_path):
-                logger.error(f"  {rel} (error)")
-                success = False
-            else:
+    # Check each needed tool once, before any formatter runs
+    if "cpp" in jobs and not shutil.which(get_mise_tool_cmd("clang-format")[0]):
+        logger.error("clang-format not found. Please install it first.")
+        sys.exit(1)
+    if "shell" in jobs and not shutil.which("shfmt"):
+        logger.error("shfmt not found. Please install it first.")
+        logger.error(
+            "Install with: brew install shfmt (macOS) or apt-get install shfmt (Linux)"
+        )
+        sys.exit(1)
+    if "python" in jobs:
+        _check_venv_tool(_RUFF)
+    if "cmake" in jobs:
+        _check_venv_tool(_CMAKE_FORMAT)
+
+    # The tools run on disjoint file sets in child processes, so threads are
+    # enough to overlap them; results are reported in formatter order
+    with ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1)) as pool:
+        futures = {
+            file_type: pool.submit(formatters[file_type], paths, root_dir)
+            for file_type, paths in jobs.items()
+        }
+
+        for file_type, paths in jobs.items():
+            failed = futures[file_type].result()
+            for file_path in paths:
+                rel = file_path.relative_to(root_dir)
+                if file_path in failed:
+                    logger.error(f"  {rel} (error)")
+                    success = False
+                    continue
                 files_formatted += 1
                 formatted_paths.append(file_path)
-                changed = file_path.read_bytes() != before
-                if changed:
+                if file_path.read_bytes() != before[file_path]:
                     files_changed += 1
                     logger.info(f"  {rel} (changed)")
                 else:
@@ -411,9 +465,20 @@ def main() -> None:
     # Stage all formatted files if requested (they were dirty to begin with)
     if args.stage and formatted_paths:
         try:
+            # Paths go over stdin (NUL-separated), so argv length is never
+            # an issue; --literal-pathspecs stops names being read as globs
             subprocess.run(
-                ["git", "add", "--"] + [str(p) for p in formatted_paths],
+                [
+                    "git",
+                    "--literal-pathspecs",
+                    "add",
+                    "--pathspec-from-file=-",
+                    "--pathspec-file-nul",
+                ],
                 cwd=root_dir,
+                input=b"\0".join(
+                    os.fsencode(p.relative_to(root_dir)) for p in formatted_paths
+                ),
                 check=True,
             )
             logger.info(f"Staged {len(formatted_paths)} files")
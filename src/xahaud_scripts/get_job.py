@@ -4,20 +4,64 @@ GitHub Actions Steps Fetcher - Retrieves steps from GitHub Actions jobs.
 No GitHub token required for public repositories.
 """
 
+import io
+import json
 import os
 import re
 import sys
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from pathlib import Path
 from typing import Any
 
 import click
 import requests
+from requests.adapters import HTTPAdapter
 
 from xahaud_scripts.utils.clipboard import get_clipboard
 from xahaud_scripts.utils.logging import make_logger, setup_logging
 
 logger = make_logger(__name__)
 
+_REPO_RE = re.compile(r"github\.com/([^/]+)/([^/?#]+)")
+_RUN_RE = re.compile(r"runs/(\d+)")
+_JOB_RE = re.compile(r"job/(\d+)")
+
+_GROUP_MARKER = "##[group]"
+_STEP_ACTIONS = ("Starting", "Finishing", "Completing", "Running", "Executing")
+
+# Completed jobs are immutable, so their details are cached across runs
+JOB_CACHE_DIR = Path.home() / ".cache" / "xahaud-scripts" / "jobs"
+
+# Step conclusions whose output is worth fetching the job log for
+FAILED_CONCLUSIONS = ("failure", "timed_out")
+
+
+def _parse_step_marker(line: str) -> tuple[str, str] | None:
+    """Return (action, step_name) for a "##[group]<Action>: <name>" line.
+
+    Plain str.find scans instead of a regex: markers are a fixed literal,
+    and this runs on every line of the job log. The marker is not
+    anchored, since lines usually carry a leading timestamp.
+    """
+    start = line.find(_GROUP_MARKER)
+    if start == -1:
+        return None
+    start += len(_GROUP_MARKER)
+
+    # Leftmost "<Action>: " after the marker wins
+    found: tuple[int, str] | None = None
+    for action in _STEP_ACTIONS:
+        idx = line.find(f"{action}: ", start)
+        if idx != -1 and (found is None or idx < found[0]):
+            found = (idx, action)
+    if found is None:
+        return None
+
+    idx, action = found
+    return action, line[idx + len(action) + 2 :].strip()
+
 
 class GitHubActionsFetcher:
     def __init__(self, url: str) -> None:
@@ -30,6 +74,27 @@ class GitHubActionsFetcher:
         self.repo = parsed["repo"]
         self.run_id = parsed.get("run_id")
         self.job_id = parsed.get("job_id")
+        self._job_details: dict[str, dict[str, Any]] = {}
+        # One pooled session so repeated/concurrent API calls reuse connections;
+        # static headers are set once, Accept is overridden per request
+        self._session = requests.Session()
+        # Room for the thread pool in main() to keep its connections alive
+        self._session.mount(
+            "https://", HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        )
+        self._session.headers.update(
+            {
+                "Accept": "application/vnd.github+json",
+                "User-Agent": "GitHubActionsStepsFetcher/1.0",
+                "X-GitHub-Api-Version": "2022-11-28",
+            }
+        )
+        github_token = os.environ.get("GITHUB_TOKEN")
+        if github_token:
+            logger.debug("Using GitHub token from environment variable")
+            self._session.headers["Authorization"] = f"Bearer {github_token}"
+        else:
+            logger.debug("No GitHub token found in environment")
 
         if not self.owner or not self.repo:
             raise ValueError("Could not extract repository information from URL")
@@ -47,58 +112,38 @@ class GitHubActionsFetcher:
         }
 
         # Extract owner and repo
-        repo_pattern = r"github\.com/([^/]+)/([^/]+)"
-        repo_match = re.search(repo_pattern, url)
+        repo_match = _REPO_RE.search(url)
         if repo_match:
             result["owner"] = repo_match.group(1)
-            result["repo"] = repo_match.group(2).split("/")[0]
+            result["repo"] = repo_match.group(2)
 
         # Extract run ID
-        run_pattern = r"runs/(\d+)"
-        run_match = re.search(run_pattern, url)
+        run_match = _RUN_RE.search(url)
         if run_match:
             result["run_id"] = run_match.group(1)
 
         # Extract job ID
-        job_pattern = r"job/(\d+)"
-        job_match = re.search(job_pattern, url)
+        job_match = _JOB_RE.search(url)
         if job_match:
             result["job_id"] = job_match.group(1)
 
         return result
 
-    def _make_request(
-        self, url: str, accept_header: str = "application/vnd.github+json"
-    ) -> Any:
-        """Make a request to the GitHub API."""
-        headers = {
-            "Accept": accept_header,
-            "User-Agent": "GitHubActionsStepsFetcher/1.0",
-            "X-GitHub-Api-Version": "2022-11-28",
-        }
-
-        github_token = os.environ.get("GITHUB_TOKEN")
-        if github_token:
-            logger.debug("Using GitHub token from environment variable")
-            headers["Authorization"] = f"Bearer {github_token}"
-        else:
-            logger.debug("No GitHub token found in environment")
-
+    def _get(
+        self, url: str, accept_header: str, stream: bool = False
+    ) -> requests.Response:
+        """GET a GitHub API URL, exiting with a message on HTTP errors."""
         logger.debug(f"Making request to: {url}")
 
         try:
-            response = requests.get(url, headers=headers, allow_redirects=True)
+            response = self._session.get(
+                url,
+                headers={"Accept": accept_header},
+                allow_redirects=True,
+                stream=stream,
+            )
             response.raise_for_status()
-
-            content_type = response.headers.get("Content-Type", "")
-            logger.debug(f"Response content type: {content_type}")
-
-            if "json" in content_type:
-                logger.debug("Successfully parsed JSON response")
-                return response.json()
-            else:
-                logger.debug(f"Received {len(response.content)} bytes of non-JSON data")
-                return response.text
+            return response
 
         except requests.exceptions.HTTPError as e:
             status_code = e.response.status_code if e.response else 0
@@ -120,6 +165,33 @@ class GitHubActionsFetcher:
             logger.error(f"Request failed: {e}")
             sys.exit(1)
 
+    def _make_request(
+        self, url: str, accept_header: str = "application/vnd.github+json"
+    ) -> Any:
+        """Make a request to the GitHub API."""
+        response = self._get(url, accept_header)
+
+        content_type = response.headers.get("Content-Type", "")
+        logger.debug(f"Response content type: {content_type}")
+
+        if "json" in content_type:
+            logger.debug("Successfully parsed JSON response")
+            return response.json()
+        else:
+            logger.debug(f"Received {len(response.content)} bytes of non-JSON data")
+            return response.text
+
+    def _make_request_stream(
+        self, url: str, accept_header: str = "application/vnd.github+json"
+    ) -> Iterator[str]:
+        """Make a streaming request, yielding decoded lines as they arrive."""
+        response = self._get(url, accept_header, stream=True)
+        # Log blobs are served as text/plain without a charset; requests
+        # would otherwise fall back to ISO-8859-1.
+        response.encoding = "utf-8"
+        with response:
+            yield from response.iter_lines(chunk_size=65536, decode_unicode=True)
+
     def get_run_jobs(self, run_id: str) -> list[dict[str, Any]]:
         """Get all jobs for a specific workflow run."""
         url = (
@@ -131,52 +203,82 @@ class GitHubActionsFetcher:
         logger.info(f"Found {len(jobs)} jobs")
         return jobs
 
+    def _job_cache_path(self, job_id: str) -> Path:
+        return JOB_CACHE_DIR / f"{self.owner}__{self.repo}__{job_id}.json"
+
     def get_job_details(self, job_id: str) -> dict[str, Any]:
-        """Get details for a specific job."""
-        url = f"{self.base_url}/repos/{self.owner}/{self.repo}/actions/jobs/{job_id}"
-        logger.info(f"Fetching details for job ID: {job_id}")
-        return self._make_request(url)
+        """Get details for a specific job.
+
+        Results are memoized per run, and completed jobs (which no longer
+        change) are also cached on disk for repeat invocations.
+        """
+        if job_id in self._job_details:
+            return self._job_details[job_id]
 
-    def get_job_logs(self, job_id: str) -> str:
-        """Get logs for a specific job."""
+        cache_file = self._job_cache_path(job_id)
+        try:
+            job = json.loads(cache_file.read_text())
+            logger.debug(f"Using cached job details: {cache_file}")
+        except (OSError, ValueError):
+            url = (
+                f"{self.base_url}/repos/{self.owner}/{self.repo}/actions/jobs/{job_id}"
+            )
+            logger.info(f"Fetching details for job ID: {job_id}")
+            job = self._make_request(url)
+            if job.get("status") == "completed":
+                try:
+                    cache_file.parent.mkdir(parents=True, exist_ok=True)
+                    cache_file.write_text(json.dumps(job))
+                except OSError as e:
+                    logger.debug(f"Could not cache job details: {e}")
+
+        self._job_details[job_id] = job
+        return job
+
+    def get_job_logs(self, job_id: str) -> Iterator[str]:
+        """Stream logs for a specific job, one line at a time."""
         url = (
             f"{self.base_url}/repos/{self.owner}/{self.repo}/actions/jobs/{job_id}/logs"
         )
         logger.info(f"Fetching logs for job ID: {job_id}")
+        line_count = 0
         try:
-            logs = self._make_request(url)
-            logger.info(f"Retrieved {len(logs)} bytes of log data")
-            return logs
+            for line in self._make_request_stream(url):
+                line_count += 1
+                yield line
         except Exception as e:
             logger.warning(f"Could not fetch logs for job {job_id}: {e}")
-            return ""
+            return
+        logger.info(f"Retrieved {line_count} lines of log data")
+
+    def _extract_step_logs(self, lines: Iterable[str]) -> dict[str, str]:
+        """Extract individual step logs from the lines of a job log.
 
-    def _extract_step_logs(self, full_log: str) -> dict[str, str]:
-        """Extract individual step logs from the full job log."""
+        Each step's lines are appended to a StringIO as they stream in and
+        materialized once at the step boundary, instead of being held as a
+        list of line strings and then joined.
+        """
         step_logs: dict[str, str] = {}
         current_step: str | None = None
-        current_content: list[str] = []
-
-        step_pattern = re.compile(
-            r"##\[group\](.*?)(Starting|Finishing|Completing|Running|Executing): (.*?)$"
-        )
+        current_content = io.StringIO()
+        current_lines = 0
 
         logger.debug("Extracting step logs from full job log")
         line_count = 0
 
-        for line in full_log.splitlines():
+        for line in lines:
             line_count += 1
-            match = step_pattern.search(line)
-            if match:
+            marker = _parse_step_marker(line)
+            if marker:
                 if current_step:
-                    step_logs[current_step] = "\n".join(current_content)
+                    step_logs[current_step] = current_content.getvalue()
                     logger.debug(
-                        f"Extracted {len(current_content)} lines for step: {current_step}"
+                        f"Extracted {current_lines} lines for step: {current_step}"
                     )
-                    current_content = []
+                    current_content = io.StringIO()
+                    current_lines = 0
 
-                action = match.group(2)
-                step_name = match.group(3).strip()
+                action, step_name = marker
 
                 if action == "Starting":
                     current_step = step_name
@@ -184,14 +286,19 @@ class GitHubActionsFetcher:
                 elif current_step is None and action in ["Running", "Executing"]:
                     current_step = step_name
                     logger.debug(f"Found in-progress step: {current_step}")
+                elif action in ("Finishing", "Completing"):
+                    # The step's block is closed; don't let trailing lines
+                    # overwrite its output at the next marker
+                    current_step = None
             elif current_step:
-                current_content.append(line)
+                if current_lines:
+                    current_content.write("\n")
+                current_content.write(line)
+                current_lines += 1
 
-        if current_step and current_content:
-            step_logs[current_step] = "\n".join(current_content)
-            logger.debug(
-                f"Extracted {len(current_content)} lines for step: {current_step}"
-            )
+        if current_step and current_lines:
+            step_logs[current_step] = current_content.getvalue()
+            logger.debug(f"Extracted {current_lines} lines for step: {current_step}")
 
         logger.info(
             f"Processed {line_count} lines of logs, extracted {len(step_logs)} steps"
@@ -204,8 +311,9 @@ class GitHubActionsFetcher:
             return "N/A"
 
         try:
-            start = datetime.fromisoformat(start_time.replace("Z", "+00:00"))
-            end = datetime.fromisoformat(end_time.replace("Z", "+00:00"))
+            # fromisoformat accepts a trailing "Z" natively (Python 3.11+)
+            start = datetime.fromisoformat(start_time)
+            end = datetime.fromisoformat(end_time)
             duration = (end - start).total_seconds()
 
             if duration < 60:
@@ -222,8 +330,61 @@ class GitHubActionsFetcher:
             logger.debug(f"Error calculating duration: {e}")
             return "N/A"
 
-    def print_steps(self, job: dict[str, Any], include_logs: bool = True) -> None:
-        """Print steps information for a job."""
+    def get_step_logs(
+        self, job: dict[str, Any], only_failed: bool = False
+    ) -> dict[str, str]:
+        """Fetch a job's logs and split them per step.
+
+        Returns {} without a request if the job has no steps, or if
+        only_failed is set and none of its steps failed or timed out.
+        """
+        steps = job.get("steps")
+        if not steps:
+            return {}
+        if only_failed and not any(
+            step.get("conclusion") in FAILED_CONCLUSIONS for step in steps
+        ):
+            logger.debug(f"No failed steps in job {job['id']}, skipping logs")
+            return {}
+        return self._extract_step_logs(self.get_job_logs(str(job["id"])))
+
+    @staticmethod
+    def _truncate_log(text: str, head: int = 20, tail: int = 20) -> str:
+        """Keep the first head and last tail lines of a step log.
+
+        Logs of up to 50 lines are returned whole. Longer ones are cut by
+        scanning for newlines from each end, so a huge log is never split
+        into a list just to print 40 lines of it.
+        """
+        newlines = text.count("\n")
+        if newlines < 50:
+            return text
+
+        head_end = -1
+        for _ in range(head):
+            head_end = text.find("\n", head_end + 1)
+        tail_start = len(text)
+        for _ in range(tail):
+            tail_start = text.rfind("\n", 0, tail_start)
+
+        skipped = newlines + 1 - head - tail
+        return (
+            f"{text[:head_end]}\n\n... {skipped} more lines ...\n\n"
+            f"{text[tail_start + 1 :]}"
+        )
+
+    def print_steps(
+        self,
+        job: dict[str, Any],
+        include_logs: bool = True,
+        step_logs: dict[str, str] | None = None,
+        only_failed: bool = False,
+    ) -> None:
+        """Print steps information for a job.
+
+        Pass step_logs to print logs that were already fetched; otherwise
+        they are fetched here when include_logs is set.
+        """
         job_name = job.get("name", "Unknown Job")
         steps = job.get("steps", [])
 
@@ -234,12 +395,8 @@ class GitHubActionsFetcher:
             print("No steps found for this job.")
             return
 
-        job_logs = ""
-        step_logs: dict[str, str] = {}
-        if include_logs:
-            job_logs = self.get_job_logs(str(job["id"]))
-            if job_logs:
-                step_logs = self._extract_step_logs(job_logs)
+        if step_logs is None:
+            step_logs = self.get_step_logs(job, only_failed) if include_logs else {}
 
         for i, step in enumerate(steps, 1):
             step_name = step.get("name", f"Step {i}")
@@ -257,13 +414,7 @@ class GitHubActionsFetcher:
             if step_name in step_logs and step_logs[step_name].strip():
                 print("\n  Output:")
                 print("-" * 80)
-                log_lines = step_logs[step_name].splitlines()
-                if len(log_lines) > 50:
-                    print("\n".join(log_lines[:20]))
-                    print(f"\n... {len(log_lines) - 40} more lines ...\n")
-                    print("\n".join(log_lines[-20:]))
-                else:
-                    print(step_logs[step_name])
+                print(self._truncate_log(step_logs[step_name]))
                 print("-" * 80)
 
 
@@ -278,6 +429,11 @@ class GitHubActionsFetcher:
     help="Set logging level",
 )
 @click.option("--raw-logs", is_flag=True, help="Output raw logs without parsing")
+@click.option(
+    "--only-failed-logs/--all-logs",
+    default=True,
+    help="Only fetch logs for jobs with a failed or timed-out step",
+)
 @click.option(
     "--token",
     envvar="GITHUB_TOKEN",
@@ -289,6 +445,7 @@ def main(
     no_logs: bool,
     log_level: str,
     raw_logs: bool,
+    only_failed_logs: bool,
     token: str | None,
 ) -> None:
     """Fetch GitHub Actions job steps.
@@ -314,10 +471,10 @@ def main(
         if fetcher.job_id:
             job = fetcher.get_job_details(fetcher.job_id)
             if raw_logs:
-                logs = fetcher.get_job_logs(fetcher.job_id)
-                print(logs)
+                for line in fetcher.get_job_logs(fetcher.job_id):
+                    print(line)
                 return
-            fetcher.print_steps(job, not no_logs)
+            fetcher.print_steps(job, not no_logs, only_failed=only_failed_logs)
 
         elif fetcher.run_id:
             jobs = fetcher.get_run_jobs(fetcher.run_id)
@@ -325,9 +482,27 @@ def main(
                 logger.error("No jobs found for this workflow run.")
                 sys.exit(1)
 
-            for job in jobs:
-                detailed_job = fetcher.get_job_details(str(job["id"]))
-                fetcher.print_steps(detailed_job, not no_logs)
+            def with_steps(job: dict[str, Any]) -> dict[str, Any]:
+                # The run's job list already carries steps; only fall back
+                # to a per-job detail request when they are missing
+                if job.get("steps") is None:
+                    return fetcher.get_job_details(str(job["id"]))
+                return job
+
+            # Fetch details, then logs, for all jobs concurrently; print in
+            # the original job order as each job's logs become ready
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                jobs = list(pool.map(with_steps, jobs))
+                log_futures = [
+                    None
+                    if no_logs
+                    else pool.submit(fetcher.get_step_logs, job, only_failed_logs)
+                    for job in jobs
+                ]
+                for job, future in zip(jobs, log_futures, strict=True):
+                    fetcher.print_steps(
+                        job, step_logs=future.result() if future else {}
+                    )
         else:
             logger.error("Could not extract run ID or job ID from URL")
             sys.exit(1)
@@ -12,10 +12,13 @@ Features include:
 import contextlib
 import fcntl
 import json
+import logging
 import os
 import shutil
 import subprocess
 import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 
 import click
@@ -38,7 +41,6 @@ from xahaud_scripts.utils.lldb import create_lldb_script
 from xahaud_scripts.utils.logging import make_logger, setup_logging
 from xahaud_scripts.utils.paths import get_xahaud_root
 from xahaud_scripts.utils.shell_utils import (
-    change_directory,
     check_tool_exists,
     run_command,
 )
@@ -125,22 +127,128 @@ def get_build_output_path(xahaud_root: str, build_type: str) -> Path:
     return OUTPUTS_DIR / f"{slug}.txt"
 
 
-def do_build_jshooks_header(tee_file: Path | None = None) -> None:
-    """Build the JS hooks header."""
+def _write_output(block: bytes, tee_file: Path | None = None) -> None:
+    """Write a captured output block to stdout (and tee_file) in one piece."""
+    if not block:
+        return
+    sys.stdout.flush()
+    out = getattr(sys.stdout, "buffer", None)
+    if out is not None:
+        out.write(block)
+        out.flush()
+    else:
+        sys.stdout.write(block.decode(errors="replace"))
+        sys.stdout.flush()
+    if tee_file is not None:
+        with open(tee_file, "ab") as tf:
+            tf.write(block)
+
+
+def _write_step_outputs(
+    futures: list[Future[bytes]], tee_file: Path | None = None
+) -> None:
+    """Write each captured step's output in order, then raise the first error.
+
+    Every step is waited on and written out, so a failing first step
+    doesn't hide the output of the ones after it.
+    """
+    first_error: BaseException | None = None
+    for future in futures:
+        try:
+            _write_output(future.result(), tee_file)
+        except subprocess.CalledProcessError as e:
+            _write_output(e.output or b"", tee_file)
+            first_error = first_error or e
+        except Exception as e:
+            first_error = first_error or e
+    if first_error is not None:
+        raise first_error
+
+
+def _run_step(
+    cmd: list[str],
+    tee_file: Path | None = None,
+    cwd: str | None = None,
+    capture: bool = False,
+) -> bytes:
+    """Run a build step, streamed or with its output captured.
+
+    With capture, stdout+stderr are returned as one block instead of being
+    streamed, so steps running side by side don't interleave; a failure
+    raises CalledProcessError carrying that block as its output.
+    """
+    if not capture:
+        run_command(cmd, tee_file=tee_file, cwd=cwd)
+        return b""
+    logger.info(f"Running command: {json.dumps(cmd)}")
+    proc = subprocess.run(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, cwd=cwd
+    )
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd, output=proc.stdout)
+    return proc.stdout
+
+
+def do_build_jshooks_header(
+    tee_file: Path | None = None, cwd: str | None = None, capture: bool = False
+) -> bytes:
+    """Build the JS hooks header.
+
+    Returns:
+        bytes: the step's output when capture is set, else b""
+    """
     logger.info("Building JS hooks header...")
 
     try:
-        run_command(["build-jshooks-header", "--canonical"], tee_file=tee_file)
+        output = _run_step(
+            ["build-jshooks-header", "--canonical"],
+            tee_file=tee_file,
+            cwd=cwd,
+            capture=capture,
+        )
         logger.info("JS hooks header built successfully")
+        return output
     except Exception as e:
         logger.error(f"Failed to build JS hooks header: {e}")
         raise
 
 
+def do_compile_test_hooks(
+    compile_hooks: Path,
+    hooks_c_dir: tuple[str, ...] = (),
+    hook_coverage: bool = False,
+    tee_file: Path | None = None,
+    cwd: str | None = None,
+    capture: bool = False,
+) -> bytes:
+    """Compile the WASM hooks embedded in a test file via hookz.
+
+    Returns:
+        bytes: the step's output when capture is set, else b""
+    """
+    logger.info(f"Compiling WASM hooks from {compile_hooks}...")
+
+    try:
+        cmd = ["hookz", "build-test-hooks", str(compile_hooks.resolve())]
+        for entry in hooks_c_dir:
+            cmd.extend(["--hooks-c-dir", entry])
+        if hook_coverage:
+            cmd.append("--hook-coverage")
+        output = _run_step(cmd, tee_file=tee_file, cwd=cwd, capture=capture)
+        logger.info("WASM hooks compiled successfully")
+        return output
+    except Exception as e:
+        logger.error(f"Failed to compile WASM hooks: {e}")
+        raise
+
+
 def build_rippled(
     reconfigure_build: bool = False,
     coverage: bool = False,
     coverage_impl: str = "gcov",
+    coverage_include: tuple[str, ...] = (),
+    coverage_exclude: tuple[str, ...] = (),
+    coverage_opt_level: int = 0,
     use_conan: bool = True,
     ubsan: bool = False,
     stdlib_hardening: bool = False,
@@ -149,6 +257,7 @@ def build_rippled(
     ccache_basedir: str | None = None,
     ccache_sloppy: bool = False,
     ccache_debug: bool = False,
+    ccache_remote_storage: str | None = None,
     target: str = "rippled",
     log_line_numbers: bool = True,
     build_type: str = "Release",
@@ -157,26 +266,32 @@ def build_rippled(
     build_dir: str | None = None,
     tee_file: Path | None = None,
     jobs: int | None = None,
+    force_conan: bool = False,
 ) -> bool:
     """Build the rippled executable.
 
     Args:
         reconfigure_build: If True, force CMake reconfiguration even if build directory exists
         coverage: If True, enable code coverage
+        coverage_include: llvm-injected only; source globs to instrument
+        coverage_exclude: llvm-injected only; extra source globs to skip
+        coverage_opt_level: llvm-injected only; -O level for instrumented code
         use_conan: If True, use Conan package manager for dependencies
         ubsan: If True, enable UndefinedBehaviorSanitizer
         stdlib_hardening: If True, enable standard library hardening checks
         verbose: If True, enable verbose output during build
         use_ccache: If True, use ccache to speed up compilation
         ccache_basedir: Base directory for ccache path normalization (cache sharing)
-        ccache_sloppy: If True, ignore locale, __DATE__, __TIME__ differences
+        ccache_sloppy: If True, relax ccache hashing (see ccache.CCACHE_SLOPPINESS)
         ccache_debug: If True, enable ccache debug logging
+        ccache_remote_storage: ccache remote storage URL(s) for the build
         target: Build target (e.g., rippled, xrpld)
         log_line_numbers: If True, enable BEAST_ENHANCED_LOGGING
         build_type: CMake build type (Debug or Release)
         dry_run: If True, print commands without executing
         unity: If True, enable unity builds (faster clean builds, slower incremental)
         build_dir: Build directory (default: build-debug for Debug, build for Release)
+        force_conan: If True, run conan install even if its inputs are unchanged
 
     Returns:
         bool: True if build was successful, False otherwise
@@ -244,6 +359,7 @@ def build_rippled(
                 build_type=build_type,
                 build_dir=build_dir,
                 dry_run=dry_run,
+                force=force_conan,
             )
             if not success:
                 return False
@@ -254,6 +370,9 @@ def build_rippled(
                 build_type=build_type,
                 coverage=coverage,
                 coverage_impl=coverage_impl,
+                coverage_include=list(coverage_include),
+                coverage_exclude=list(coverage_exclude),
+                coverage_opt_level=coverage_opt_level,
                 verbose=verbose,
                 ubsan=ubsan,
                 stdlib_hardening=stdlib_hardening,
@@ -280,6 +399,7 @@ def build_rippled(
             ccache=use_ccache,
             ccache_basedir=ccache_basedir,
             ccache_sloppy=ccache_sloppy,
+            ccache_remote_storage=ccache_remote_storage,
             tee_file=tee_file,
         )
         if built and not dry_run:
@@ -297,6 +417,8 @@ def run_rippled(
     lldb_all_threads: bool = False,
     build_dir: str | None = None,
     tee_file: Path | None = None,
+    unittest_jobs: int | None = None,
+    parallel_runs: int = 1,
 ) -> int:
     """Run the rippled executable, optionally with lldb, multiple times.
 
@@ -309,88 +431,142 @@ def run_rippled(
         env: Environment variables to set for the process
         lldb_all_threads: Whether to show all threads in LLDB backtrace
         build_dir: Build directory containing the rippled executable
+        unittest_jobs: Split the suites across this many rippled child
+            processes (rippled's --unittest-jobs); ignored under lldb
+        parallel_runs: Run up to this many of the `times` repetitions at
+            once; needs stop_on_fail=False and no lldb
 
     Returns:
-        int: the exit code of the last run
+        int: the exit code of the last run (parallel: of the first failure)
     """
     if build_dir is None:
         build_dir = os.path.join(get_xahaud_root(), "build")
 
-    # Verify the rippled executable exists
-    rippled_path = os.path.join(build_dir, "rippled")
-    if not os.path.exists(rippled_path):
-        rippled_path = os.path.join(build_dir, "rippled.exe")
-        if not os.path.exists(rippled_path):
-            logger.error("Rippled executable not found. Build may have failed.")
-            return 1
-
+    # Verify the rippled executable exists; resolved once, the loop below
+    # runs it by absolute path
+    binary = find_rippled_binary(build_dir)
+    if binary is None:
+        logger.error("Rippled executable not found. Build may have failed.")
+        return 1
+    rippled_path = os.path.abspath(binary)
     logger.info(f"Found rippled at {rippled_path}")
 
     test_args = ["-u"] + args
+    if unittest_jobs and unittest_jobs > 1:
+        if use_lldb:
+            # lldb would only follow the parent, not the worker processes
+            logger.warning("Ignoring --unittest-jobs under lldb")
+        else:
+            test_args += ["--unittest-jobs", str(unittest_jobs)]
     exit_code = 0
-    temp_lldb_script = None
 
     # If lldb is requested, check if it's available
     if use_lldb and not check_tool_exists("lldb"):
         logger.error("LLDB is required but not found in PATH")
         return 1
 
-    # Create a default LLDB script if requested but none provided
+    # Use the default LLDB script if requested but none provided
     if use_lldb and not lldb_commands_file:
-        temp_lldb_script = create_lldb_script(all_threads=lldb_all_threads)
-        lldb_commands_file = temp_lldb_script
+        lldb_commands_file = create_lldb_script(all_threads=lldb_all_threads)
         logger.info(
-            f"Created default LLDB script at {lldb_commands_file} (all_threads={lldb_all_threads})"
+            f"Using default LLDB script at {lldb_commands_file} (all_threads={lldb_all_threads})"
         )
 
-    try:
-        with change_directory(build_dir):
-            for i in range(times):
-                if times > 1:
-                    logger.info(f"\nRun {i + 1}/{times}")
-
-                if use_lldb:
-                    cmd = ["lldb", "--", "./rippled"] + test_args
-                    if lldb_commands_file:
-                        cmd = cmd[0:1] + ["-s", lldb_commands_file] + cmd[1:]
-                else:
-                    cmd = ["./rippled"] + test_args
-
-                # Don't use check=True here to allow lldb to exit naturally
-                # Pass the environment with coverage settings
-                process = run_command(
-                    cmd,
-                    check=False,
-                    env=env,
-                    tee_file=tee_file if not use_lldb else None,
-                )
-                exit_code = process.returncode
-
-                # If a run fails and we're not at the last iteration
-                if exit_code != 0 and i < times - 1:
-                    logger.warning(f"Run {i + 1} failed with exit code {exit_code}")
-
-                    if stop_on_fail:
-                        logger.info(
-                            "Stopping due to failure (use --no-stop-on-fail to continue on failures)"
-                        )
-                        break
-                    else:
-                        logger.info("Continuing to next run...")
-    finally:
-        # Clean up temporary LLDB script if we created one
-        if temp_lldb_script and os.path.exists(temp_lldb_script):
-            try:
-                os.remove(temp_lldb_script)
-                logger.debug(f"Removed temporary LLDB script {temp_lldb_script}")
-            except Exception as e:
-                logger.warning(
-                    f"Could not remove temporary LLDB script {temp_lldb_script}: {e}"
+    if parallel_runs > 1 and times > 1:
+        if use_lldb or stop_on_fail:
+            logger.warning(
+                "Ignoring --parallel-runs: it needs --no-stop-on-fail and no lldb"
+            )
+        else:
+            return _run_rippled_parallel(
+                [rippled_path] + test_args,
+                times,
+                parallel_runs,
+                env=env,
+                build_dir=build_dir,
+                tee_file=tee_file,
+            )
+
+    for i in range(times):
+        if times > 1:
+            logger.info(f"\nRun {i + 1}/{times}")
+
+        if use_lldb:
+            cmd = ["lldb", "--", rippled_path] + test_args
+            if lldb_commands_file:
+                cmd = cmd[0:1] + ["-s", lldb_commands_file] + cmd[1:]
+        else:
+            cmd = [rippled_path] + test_args
+
+        # Don't use check=True here to allow lldb to exit naturally
+        # Pass the environment with coverage settings
+        process = run_command(
+            cmd,
+            check=False,
+            env=env,
+            tee_file=tee_file if not use_lldb else None,
+            cwd=build_dir,
+        )
+        exit_code = process.returncode
+
+        # If a run fails and we're not at the last iteration
+        if exit_code != 0 and i < times - 1:
+            logger.warning(f"Run {i + 1} failed with exit code {exit_code}")
+
+            if stop_on_fail:
+                logger.info(
+                    "Stopping due to failure (use --no-stop-on-fail to continue on failures)"
                 )
+                break
+            else:
+                logger.info("Continuing to next run...")
 
     return exit_code
 
 
+def _run_rippled_parallel(
+    cmd: list[str],
+    times: int,
+    parallel_runs: int,
+    env: dict | None = None,
+    build_dir: str | None = None,
+    tee_file: Path | None = None,
+) -> int:
+    """Run cmd `times` times, up to `parallel_runs` at once.
+
+    Each run's output is captured and printed whole when it finishes, so
+    concurrent runs don't interleave. Coverage counters from concurrent
+    runs merge safely (libgcov locks .gcda files; LLVM uses the %m pool).
+
+    Returns:
+        int: 0 if every run passed, else the exit code of the first failure
+    """
+    logger.info(f"Running {times} times, {parallel_runs} at a time")
+    lock = threading.Lock()
+
+    def run_once(i: int) -> int:
+        proc = subprocess.run(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            env=env,
+            cwd=build_dir,
+        )
+        header = f"\n=== Run {i + 1}/{times} (exit code {proc.returncode}) ===\n"
+        with lock:
+            _write_output(header.encode() + proc.stdout, tee_file)
+        return proc.returncode
+
+    with ThreadPoolExecutor(max_workers=parallel_runs) as pool:
+        exit_codes = list(pool.map(run_once, range(times)))
+
+    failures = [(i, rc) for i, rc in enumerate(exit_codes) if rc != 0]
+    for i, rc in failures:
+        logger.warning(f"Run {i + 1} failed with exit code {rc}")
+    logger.info(f"{times - len(failures)}/{times} runs passed")
+    return failures[0][1] if failures else 0
+
+
 @click.command()
 @click.option(
     "--log-level",
@@ -442,6 +618,22 @@ def run_rippled(
     help="File containing lldb commands to run before running rippled",
 )
 @click.option("--times", default=1, type=int, help="Number of times to run the command")
+@click.option(
+    "--unittest-jobs",
+    type=int,
+    default=None,
+    help="Run the unit tests across N rippled worker processes (ignored with lldb)",
+)
+@click.option(
+    "--parallel-runs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help=(
+        "Run up to N of the --times repetitions concurrently, each with its "
+        "output printed when it finishes. Needs --no-stop-on-fail; no lldb."
+    ),
+)
 @click.option(
     "--stop-on-fail/--no-stop-on-fail",
     is_flag=True,
@@ -479,6 +671,37 @@ def run_rippled(
         ".gcda artifacts from cross-contaminating."
     ),
 )
+@click.option(
+    "--coverage-include",
+    multiple=True,
+    metavar="GLOB",
+    help=(
+        "llvm-injected only: instrument just sources matching GLOB "
+        "(-fprofile-list source:GLOB=allow), winning over --coverage-exclude. "
+        "Repeatable; applies on reconfigure."
+    ),
+)
+@click.option(
+    "--coverage-exclude",
+    multiple=True,
+    metavar="GLOB",
+    help=(
+        "llvm-injected only: skip instrumenting sources matching GLOB, on top "
+        "of the conan cache and /usr, unless --coverage-include also matches. "
+        "Repeatable; applies on reconfigure."
+    ),
+)
+@click.option(
+    "--coverage-opt-level",
+    type=click.IntRange(0, 2),
+    default=0,
+    show_default=True,
+    help=(
+        "llvm-injected only: optimization level for the instrumented build. "
+        "0 maps every line exactly; 1 runs tests much faster but may fold or "
+        "inline lines. Applies on reconfigure."
+    ),
+)
 @click.option(
     "--ubsan/--no-ubsan",
     is_flag=True,
@@ -504,6 +727,12 @@ def run_rippled(
     default=True,
     help="Use Conan package manager for dependencies (default: enabled)",
 )
+@click.option(
+    "--force-conan/--no-force-conan",
+    is_flag=True,
+    default=False,
+    help="Run conan install on reconfigure even if conanfile/profile are unchanged",
+)
 @click.option(
     "--verbose/--no-verbose",
     is_flag=True,
@@ -520,7 +749,7 @@ def run_rippled(
     "--ccache/--no-ccache",
     is_flag=True,
     default=None,
-    help="Use ccache to speed up compilation",
+    help="Use ccache to speed up compilation (default: on when ccache is on PATH)",
 )
 @click.option(
     "--ccache-basedir",
@@ -531,7 +760,7 @@ def run_rippled(
     "--ccache-sloppy/--no-ccache-sloppy",
     is_flag=True,
     default=True,
-    help="Ignore locale and __DATE__/__TIME__ differences in ccache (default: on)",
+    help="Relax ccache hashing (locale, __DATE__/__TIME__, header mtimes) so worktrees share hits (default: on)",
 )
 @click.option(
     "--ccache-debug/--no-ccache-debug",
@@ -539,6 +768,17 @@ def run_rippled(
     default=False,
     help="Enable ccache debug logging to ~/.config/xahaud-scripts/ccache-<timestamp>.log",
 )
+@click.option(
+    "--ccache-remote-storage",
+    envvar="CCACHE_REMOTE_STORAGE",
+    default=None,
+    metavar="URL",
+    help=(
+        "Shared ccache remote storage, e.g. redis://host:6379 or "
+        "'http://host:8080|read-only=true'. The local cache is still used "
+        "(default: $CCACHE_REMOTE_STORAGE)"
+    ),
+)
 @click.option(
     "--ccache-stats/--no-ccache-stats",
     is_flag=True,
@@ -584,7 +824,7 @@ def run_rippled(
     "--jobs",
     type=int,
     default=None,
-    help="Parallel build jobs (default: CPU count).",
+    help="Parallel build jobs (default: ninja's own job count, else CPU count).",
 )
 @click.option(
     "--keep-gcda/--no-keep-gcda",
@@ -620,13 +860,19 @@ def main(
     lldb_all_threads,
     lldb_commands_file,
     times,
+    unittest_jobs,
+    parallel_runs,
     stop_on_fail,
     rippled_args,
     reconfigure_build,
     dry_run,
     coverage,
     coverage_impl,
+    coverage_include,
+    coverage_exclude,
+    coverage_opt_level,
     conan,
+    force_conan,
     ubsan,
     stdlib_hardening,
     verbose,
@@ -635,6 +881,7 @@ def main(
     ccache_basedir,
     ccache_sloppy,
     ccache_debug,
+    ccache_remote_storage,
     ccache_stats,
     ccache_show_config,
     target,
@@ -695,6 +942,9 @@ def main(
         # Run multiple times
         x-run-tests --times 5 --no-stop-on-fail -- unit_test_hook
 
+        # Spread the selected suites over 8 rippled worker processes
+        x-run-tests --unittest-jobs 8 -- ripple.app
+
         # Build xrpld target instead of rippled
         x-run-tests --target xrpld -- unit_test_hook
 
@@ -755,25 +1005,27 @@ def main(
         ):
             ccache = True
             logger.info("Enabled ccache from RUN_TESTS_CCACHE environment variable")
-        elif reconfigure_build:
+        elif check_tool_exists("ccache"):
             ccache = True
-            logger.info("Enabled ccache (default when --reconfigure-build)")
+            logger.info("Enabled ccache (found on PATH; --no-ccache to opt out)")
         else:
             ccache = False
 
-    # Convert Path objects to strings for JSON serialization
-    args_dict = {k: str(v) if isinstance(v, Path) else v for k, v in locals().items()}
-    logger.info(
-        f"Starting run_tests.py, running cmd with {json.dumps(args_dict, indent=2)}"
-    )
+    # Only pay for the JSON dump when INFO is actually emitted
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "Starting run_tests.py, running cmd with %s",
+            json.dumps(locals(), default=str, indent=2),
+        )
 
     logger.debug(f"Command line arguments: {' '.join(sys.argv[1:])}")
 
     # Set up run recorder
     from xahaud_scripts.utils.runs_db import RunRecorder
 
+    xahaud_root = get_xahaud_root()
     recorder = RunRecorder(
-        worktree=get_xahaud_root(),
+        worktree=xahaud_root,
         target=target,
         build_type=build_type,
         test_suite=" ".join(rippled_args) if rippled_args else None,
@@ -789,11 +1041,8 @@ def main(
         # Verify lldb_commands_file path if provided
         if lldb_commands_file:
             if not os.path.isabs(lldb_commands_file):
-                # relative to the current directory before changing to xahaud root
-                original_dir = os.getcwd()
-                lldb_commands_file = os.path.join(
-                    os.path.abspath(original_dir), lldb_commands_file
-                )
+                # relative to the directory the command was run from
+                lldb_commands_file = os.path.abspath(lldb_commands_file)
                 logger.debug(
                     f"Resolved relative lldb_commands_file path to: {lldb_commands_file}"
                 )
@@ -808,8 +1057,6 @@ def main(
                     "Automatically enabled lldb mode due to lldb_commands_file being specified"
                 )
 
-        # Change to xahaud root directory
-        xahaud_root = get_xahaud_root()
         if build_dir is None:
             dir_name = "build-debug" if build_type.lower() == "debug" else "build"
             # Segregate llvm-injected coverage builds so .profraw artifacts
@@ -839,236 +1086,251 @@ def main(
         tee_file.write_text("")  # truncate at session start
         logger.info(f"Output tee: {tee_file}")
 
-        with change_directory(xahaud_root):
-            # Build JS hooks header if needed
+        # The JS hooks header and the WASM test hooks are independent
+        # generators writing different headers, so run them side by side.
+        # When both run, their output is captured and written out whole,
+        # header first, so the terminal and tee file don't interleave.
+        # Both must finish before rippled is built.
+        capture = bool(build_jshooks_header and compile_hooks)
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            futures = []
             if build_jshooks_header:
-                logger.info("Building JS hooks header...")
-                do_build_jshooks_header(tee_file=tee_file)
-
-            # Compile WASM hooks from test file if requested
-            if compile_hooks:
-                logger.info(f"Compiling WASM hooks from {compile_hooks}...")
-                try:
-                    cmd = ["hookz", "build-test-hooks", str(compile_hooks)]
-                    for entry in hooks_c_dir:
-                        cmd.extend(["--hooks-c-dir", entry])
-                    if hook_coverage:
-                        cmd.append("--hook-coverage")
-                    run_command(cmd, tee_file=tee_file)
-                    logger.info("WASM hooks compiled successfully")
-                except Exception as e:
-                    logger.error(f"Failed to compile WASM hooks: {e}")
-                    raise
-
-            # Build rippled — always. --no-build was removed deliberately:
-            # tests run against a stale binary present green results as
-            # evidence for code they never executed. An up-to-date incremental
-            # build is a cheap no-op; a stale-binary "pass" is unbounded harm.
-            logger.info("Building rippled...")
-
-            # Resolve ccache_basedir to absolute path if provided
-            resolved_ccache_basedir = None
-            if ccache_basedir:
-                resolved_ccache_basedir = os.path.abspath(ccache_basedir)
-                logger.debug(f"Resolved ccache_basedir to: {resolved_ccache_basedir}")
-
-            # Zero ccache stats before build if requested
-            if ccache_stats and ccache and not dry_run:
-                ccache_zero_stats()
-
-            recorder.build_started()
-            build_successful = build_rippled(
-                reconfigure_build=reconfigure_build or dry_run,
-                coverage=coverage,
-                coverage_impl=coverage_impl,
-                use_conan=conan,
-                ubsan=ubsan,
-                stdlib_hardening=stdlib_hardening,
-                verbose=verbose,
-                use_ccache=ccache,
-                ccache_basedir=resolved_ccache_basedir,
-                ccache_sloppy=ccache_sloppy,
-                ccache_debug=ccache_debug,
-                target=target,
-                log_line_numbers=log_line_numbers,
-                build_type=build_type,
-                dry_run=dry_run,
-                unity=unity,
-                build_dir=build_dir,
-                tee_file=tee_file,
-                jobs=jobs,
-            )
-            recorder.build_finished(build_successful)
-
-            # Show ccache stats after build if requested
-            if ccache_stats and ccache and not dry_run:
-                ccache_show_stats()
-                if ccache_show_config:
-                    _ccache_show_config()
-
-            if not build_successful:
-                logger.error("Build failed, cannot run tests")
-                recorder.save()
-                sys.exit(1)
-
-            if dry_run:
-                logger.info("Dry run complete - no commands were executed")
-                recorder.save()
-                sys.exit(0)
-
-            if save_binary and not dry_run:
-                from xahaud_scripts.binary_registry import (
-                    save_binary as save_named_binary,
-                )
-
-                binary_path = find_rippled_binary(build_dir)
-                if binary_path is None:
-                    raise click.ClickException(
-                        f"Cannot save binary {save_binary}: no rippled executable "
-                        f"found in {build_dir}"
-                    )
-                try:
-                    saved = save_named_binary(
-                        save_binary,
-                        binary_path,
-                        worktree=Path(xahaud_root),
-                        build_type=build_type,
+                futures.append(
+                    pool.submit(
+                        do_build_jshooks_header,
+                        tee_file=tee_file,
+                        cwd=xahaud_root,
+                        capture=capture,
                     )
-                except (OSError, ValueError) as exc:
-                    raise click.ClickException(
-                        f"Could not save binary {save_binary}: {exc}"
-                    ) from exc
-                logger.info(f"Saved binary @{saved.name}: {saved.path}")
-
-            # Clear stale .gcda / .profraw before test runs for clean coverage
-            if coverage and not keep_gcda:
-                from pathlib import Path as _Path
-
-                if coverage_impl == "llvm-injected":
-                    stale = list(_Path(build_dir).rglob("*.profraw"))
-                    label = ".profraw"
-                else:
-                    stale = list(_Path(build_dir).rglob("*.gcda"))
-                    label = ".gcda"
-                if stale:
-                    logger.info(
-                        f"Clearing {len(stale)} {label} files from previous runs..."
-                    )
-                    for f in stale:
-                        f.unlink()
-
-            # Strip accidental --unittest / -u from rippled args (already added by run_rippled)
-            rippled_args = list(rippled_args)
-            if rippled_args and rippled_args[0] in ("--unittest", "-u"):
-                logger.warning(
-                    f"Stripping redundant '{rippled_args[0]}' from args (-u is added automatically)"
                 )
-                rippled_args = rippled_args[1:]
-            elif rippled_args and rippled_args[0].startswith("--unittest="):
-                # --unittest=SuiteName → just keep SuiteName
-                suite = rippled_args[0].split("=", 1)[1]
-                logger.warning(
-                    "Stripping redundant '--unittest=' from args (-u is added automatically)"
+            if compile_hooks:
+                futures.append(
+                    pool.submit(
+                        do_compile_test_hooks,
+                        compile_hooks,
+                        hooks_c_dir,
+                        hook_coverage,
+                        tee_file=tee_file,
+                        cwd=xahaud_root,
+                        capture=capture,
+                    )
                 )
-                rippled_args = [suite] + rippled_args[1:]
+            _write_step_outputs(futures, tee_file)
+
+        # Build rippled — always. --no-build was removed deliberately:
+        # tests run against a stale binary present green results as
+        # evidence for code they never executed. An up-to-date incremental
+        # build is a cheap no-op; a stale-binary "pass" is unbounded harm.
+        logger.info("Building rippled...")
+
+        # Resolve ccache_basedir (relative to the xahaud root) if ccache is used
+        resolved_ccache_basedir = None
+        if ccache and ccache_basedir:
+            resolved_ccache_basedir = os.path.abspath(
+                os.path.join(xahaud_root, ccache_basedir)
+            )
+            logger.debug(f"Resolved ccache_basedir to: {resolved_ccache_basedir}")
 
-            # Run rippled with the appropriate arguments
-            logger.info(f"Running rippled with args: {' '.join(rippled_args)}")
-            env = os.environ.copy()
-            if coverage and coverage_impl == "llvm-injected":
-                # Each child process writes a uniquely-named .profraw so
-                # forks/sub-processes don't clobber each other.
-                env["LLVM_PROFILE_FILE"] = os.path.join(
-                    build_dir, "rippled-%p-%m.profraw"
-                )
-                logger.debug(f"LLVM_PROFILE_FILE={env['LLVM_PROFILE_FILE']}")
+        # Zero ccache stats before build if requested
+        if ccache_stats and ccache and not dry_run:
+            ccache_zero_stats()
 
-            if ubsan:
-                default_ubsan_options = "print_stacktrace=1:halt_on_error=1"
-                existing_ubsan_options = env.get("UBSAN_OPTIONS")
-                env["UBSAN_OPTIONS"] = (
-                    f"{default_ubsan_options}:{existing_ubsan_options}"
-                    if existing_ubsan_options
-                    else default_ubsan_options
-                )
-                logger.debug(f"UBSAN_OPTIONS={env['UBSAN_OPTIONS']}")
+        recorder.build_started()
+        build_successful = build_rippled(
+            reconfigure_build=reconfigure_build or dry_run,
+            coverage=coverage,
+            coverage_impl=coverage_impl,
+            coverage_include=coverage_include,
+            coverage_exclude=coverage_exclude,
+            coverage_opt_level=coverage_opt_level,
+            use_conan=conan,
+            ubsan=ubsan,
+            stdlib_hardening=stdlib_hardening,
+            verbose=verbose,
+            use_ccache=ccache,
+            ccache_basedir=resolved_ccache_basedir,
+            ccache_sloppy=ccache_sloppy,
+            ccache_debug=ccache_debug,
+            ccache_remote_storage=ccache_remote_storage,
+            target=target,
+            log_line_numbers=log_line_numbers,
+            build_type=build_type,
+            dry_run=dry_run,
+            unity=unity,
+            build_dir=build_dir,
+            tee_file=tee_file,
+            jobs=jobs,
+            force_conan=force_conan,
+        )
+        recorder.build_finished(build_successful)
 
-            # Determine which lldb mode to use
-            use_lldb = lldb or lldb_all_threads
+        # Show ccache stats after build if requested
+        if ccache_stats and ccache and not dry_run:
+            ccache_show_stats()
+            if ccache_show_config:
+                _ccache_show_config()
 
-            if times > 0:
-                recorder.test_started()
-            exit_code = run_rippled(
-                list(rippled_args),
-                use_lldb,
-                times,
-                stop_on_fail,
-                lldb_commands_file,
-                env=env,
-                lldb_all_threads=lldb_all_threads,
-                build_dir=build_dir,
-                tee_file=tee_file,
+        if not build_successful:
+            logger.error("Build failed, cannot run tests")
+            recorder.save()
+            sys.exit(1)
+
+        if dry_run:
+            logger.info("Dry run complete - no commands were executed")
+            recorder.save()
+            sys.exit(0)
+
+        if save_binary and not dry_run:
+            from xahaud_scripts.binary_registry import (
+                save_binary as save_named_binary,
             )
-            if times > 0:
-                recorder.test_finished(exit_code)
-
-            # Generate coverage report automatically when coverage is enabled
-            # (skip if no tests ran — nothing new to report on).
-            if coverage and times > 0:
-                if coverage_impl == "llvm-injected":
-                    from xahaud_scripts.utils.coverage_llvm import (
-                        do_generate_coverage_report_llvm,
-                    )
 
-                    do_generate_coverage_report_llvm(build_dir=build_dir)
-                else:
-                    from xahaud_scripts.utils.coverage_diff import (
-                        do_generate_coverage_report_v2,
-                    )
+            binary_path = find_rippled_binary(build_dir)
+            if binary_path is None:
+                raise click.ClickException(
+                    f"Cannot save binary {save_binary}: no rippled executable "
+                    f"found in {build_dir}"
+                )
+            try:
+                saved = save_named_binary(
+                    save_binary,
+                    binary_path,
+                    worktree=Path(xahaud_root),
+                    build_type=build_type,
+                )
+            except (OSError, ValueError) as exc:
+                raise click.ClickException(
+                    f"Could not save binary {save_binary}: {exc}"
+                ) from exc
+            logger.info(f"Saved binary @{saved.name}: {saved.path}")
+
+        # Clear stale .gcda / .profraw before test runs for clean coverage
+        if coverage and not keep_gcda:
+            label = ".profraw" if coverage_impl == "llvm-injected" else ".gcda"
+            cleared = _remove_files(build_dir, f"*{label}")
+            if cleared:
+                logger.info(f"Cleared {cleared} {label} files from previous runs")
+
+        # Strip accidental --unittest / -u from rippled args (already added by run_rippled)
+        rippled_args = list(rippled_args)
+        if rippled_args and rippled_args[0] in ("--unittest", "-u"):
+            logger.warning(
+                f"Stripping redundant '{rippled_args[0]}' from args (-u is added automatically)"
+            )
+            rippled_args = rippled_args[1:]
+        elif rippled_args and rippled_args[0].startswith("--unittest="):
+            # --unittest=SuiteName → just keep SuiteName
+            suite = rippled_args[0].split("=", 1)[1]
+            logger.warning(
+                "Stripping redundant '--unittest=' from args (-u is added automatically)"
+            )
+            rippled_args = [suite] + rippled_args[1:]
+
+        # Run rippled with the appropriate arguments
+        logger.info(f"Running rippled with args: {' '.join(rippled_args)}")
+        # Only the overrides are built here; without any, rippled simply
+        # inherits our environment and nothing is copied.
+        extra_env: dict[str, str] = {}
+        if coverage and coverage_impl == "llvm-injected":
+            # %8m turns on online merging: every process (including
+            # --unittest-jobs children) folds its counters into one of 8
+            # pooled files per binary signature instead of dumping its own
+            # .profraw. Stale files are cleared above, so runs don't mix.
+            extra_env["LLVM_PROFILE_FILE"] = os.path.join(
+                build_dir, "rippled-%8m.profraw"
+            )
+            logger.debug(f"LLVM_PROFILE_FILE={extra_env['LLVM_PROFILE_FILE']}")
 
-                    do_generate_coverage_report_v2(build_dir=build_dir)
+        if ubsan:
+            default_ubsan_options = "print_stacktrace=1:halt_on_error=1"
+            existing_ubsan_options = os.environ.get("UBSAN_OPTIONS")
+            extra_env["UBSAN_OPTIONS"] = (
+                f"{default_ubsan_options}:{existing_ubsan_options}"
+                if existing_ubsan_options
+                else default_ubsan_options
+            )
+            logger.debug(f"UBSAN_OPTIONS={extra_env['UBSAN_OPTIONS']}")
+
+        env = {**os.environ, **extra_env} if extra_env else None
+
+        # Determine which lldb mode to use
+        use_lldb = lldb or lldb_all_threads
+
+        if times > 0:
+            recorder.test_started()
+        exit_code = run_rippled(
+            list(rippled_args),
+            use_lldb,
+            times,
+            stop_on_fail,
+            lldb_commands_file,
+            env=env,
+            lldb_all_threads=lldb_all_threads,
+            build_dir=build_dir,
+            tee_file=tee_file,
+            unittest_jobs=unittest_jobs,
+            parallel_runs=parallel_runs,
+        )
+        if times > 0:
+            recorder.test_finished(exit_code)
+
+        # Generate coverage report automatically when coverage is enabled
+        # (skip if no tests ran — nothing new to report on).
+        if coverage and times > 0:
+            if coverage_impl == "llvm-injected":
+                from xahaud_scripts.utils.coverage_llvm import (
+                    do_generate_coverage_report_llvm,
+                )
 
-            # Generate diff coverage report if requested
-            if diff_cover and coverage and times > 0:
-                if coverage_impl == "llvm-injected":
-                    from xahaud_scripts.utils.coverage_llvm import (
-                        do_diff_coverage_report_llvm,
-                    )
+                do_generate_coverage_report_llvm(build_dir=build_dir)
+            else:
+                from xahaud_scripts.utils.coverage_diff import (
+                    do_generate_coverage_report_v2,
+                )
 
-                    logger.info(
-                        f"Generating diff coverage report via llvm-cov "
-                        f"(since {diff_cover_since})..."
-                    )
-                    do_diff_coverage_report_llvm(
-                        build_dir=build_dir,
-                        commitish=diff_cover_since,
-                        context_lines=diff_cover_context,
-                    )
-                else:
-                    from xahaud_scripts.utils.coverage_diff import (
-                        do_diff_coverage_report_v2,
-                    )
+                do_generate_coverage_report_v2(build_dir=build_dir)
+
+        # Generate diff coverage report if requested
+        if diff_cover and coverage and times > 0:
+            if coverage_impl == "llvm-injected":
+                from xahaud_scripts.utils.coverage_llvm import (
+                    do_diff_coverage_report_llvm,
+                )
 
-                    logger.info(
-                        f"Generating diff coverage report via gcovr "
-                        f"(since {diff_cover_since})..."
-                    )
-                    do_diff_coverage_report_v2(
-                        build_dir=build_dir,
-                        commitish=diff_cover_since,
-                        context_lines=diff_cover_context,
-                    )
-            elif coverage and times == 0:
                 logger.info(
-                    "Skipping coverage report (--times=0, no tests run). "
-                    "Use x-coverage-report / x-coverage-diff against existing "
-                    "coverage data when ready."
+                    f"Generating diff coverage report via llvm-cov "
+                    f"(since {diff_cover_since})..."
+                )
+                do_diff_coverage_report_llvm(
+                    build_dir=build_dir,
+                    commitish=diff_cover_since,
+                    context_lines=diff_cover_context,
+                )
+            else:
+                from xahaud_scripts.utils.coverage_diff import (
+                    do_diff_coverage_report_v2,
                 )
 
-            # Return the exit code from the last process
-            logger.info(f"Exiting with code {exit_code}")
-            recorder.save()
-            sys.exit(exit_code)
+                logger.info(
+                    f"Generating diff coverage report via gcovr "
+                    f"(since {diff_cover_since})..."
+                )
+                do_diff_coverage_report_v2(
+                    build_dir=build_dir,
+                    commitish=diff_cover_since,
+                    context_lines=diff_cover_context,
+                )
+        elif coverage and times == 0:
+            logger.info(
+                "Skipping coverage report (--times=0, no tests run). "
+                "Use x-coverage-report / x-coverage-diff against existing "
+                "coverage data when ready."
+            )
+
+        # Return the exit code from the last process
+        logger.info(f"Exiting with code {exit_code}")
+        recorder.save()
+        sys.exit(exit_code)
 
     except KeyboardInterrupt:
         logger.info("Interrupted by user")
@@ -1138,6 +1400,24 @@ def _has_gcda(build_dir: str) -> bool:
     return bool(result.stdout.strip())
 
 
+def _remove_files(build_dir: str, pattern: str) -> int:
+    """Delete files matching pattern under build_dir; return how many.
+
+    One `find -delete` walks and unlinks in a single process, rather than
+    materializing every path in Python and unlinking them one by one.
+    """
+    if not os.path.isdir(build_dir):
+        return 0
+    result = subprocess.run(
+        ["find", build_dir, "-type", "f", "-name", pattern, "-print", "-delete"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        logger.warning(f"Clearing {pattern} failed: {result.stderr.strip()}")
+    return result.stdout.count("\n")
+
+
 @click.command("coverage-diff")
 @click.option(
     "--since",
@@ -590,6 +590,44 @@ def _build_gcovr_cmd(
     return cmd
 
 
+def _newest_gcda_mtime(build_dir: str | Path) -> float | None:
+    """Return the newest .gcda mtime under build_dir, or None if there are none."""
+    newest: float | None = None
+    stack = [str(build_dir)]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(".gcda"):
+                    mtime = entry.stat(follow_symlinks=False).st_mtime
+                    if newest is None or mtime > newest:
+                        newest = mtime
+    return newest
+
+
+def _fresh_full_report(build_dir: str) -> Path | None:
+    """Return coverage/coverage.json if it postdates every .gcda, else None.
+
+    The full report is a superset of any filtered diff run (same gcovr
+    flags and root), so when x-run-tests has just written it the diff
+    report can read it instead of parsing every .gcda again.
+    """
+    report = Path(build_dir) / "coverage" / "coverage.json"
+    try:
+        report_mtime = report.stat().st_mtime
+    except FileNotFoundError:
+        return None
+    newest = _newest_gcda_mtime(build_dir)
+    if newest is None or newest > report_mtime:
+        return None
+    return report
+
+
 def _run_gcovr_json(
     build_dir: str,
     repo_root: str,
@@ -603,8 +641,14 @@ def _run_gcovr_json(
         filter_files: If provided, only include these files (relative paths).
 
     Returns:
-        Path to the JSON report, or None on failure.
+        Path to the JSON report (the full coverage.json when it is newer
+        than every .gcda), or None on failure.
     """
+    full_report = _fresh_full_report(build_dir)
+    if full_report is not None:
+        logger.info(f"Reusing up-to-date gcovr report {full_report}")
+        return full_report
+
     if not shutil.which("gcovr"):
         logger.error("gcovr not found on PATH")
         return None
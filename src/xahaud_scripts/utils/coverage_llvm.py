@@ -28,6 +28,17 @@ def _find_rippled_binary(build_dir: str) -> Path | None:
     return None
 
 
+def _find_profraw_files(build_dir: str) -> list[Path]:
+    """Return the .profraw files for build_dir.
+
+    x-run-tests writes them straight into the build dir, so look there
+    first and only walk the whole tree (thousands of object dirs) when
+    they were dumped somewhere else.
+    """
+    bp = Path(build_dir)
+    return sorted(bp.glob("*.profraw")) or sorted(bp.rglob("*.profraw"))
+
+
 def do_generate_coverage_report_llvm(build_dir: str) -> bool:
     """Merge .profraw → .profdata, then write llvm-cov reports.
 
@@ -42,7 +53,7 @@ def do_generate_coverage_report_llvm(build_dir: str) -> bool:
         logger.error(f"Build directory not found: {build_dir}")
         return False
 
-    profraw_files = sorted(bp.rglob("*.profraw"))
+    profraw_files = _find_profraw_files(build_dir)
     if not profraw_files:
         logger.error(
             f"No .profraw files under {build_dir}. "
@@ -135,7 +146,7 @@ def _ensure_profdata(build_dir: str) -> Path | None:
     if profdata.is_file():
         return profdata
 
-    profraw_files = sorted(bp.rglob("*.profraw"))
+    profraw_files = _find_profraw_files(build_dir)
     if not profraw_files:
         logger.error(
             f"No .profraw files under {build_dir}. "
@@ -1,12 +1,17 @@
 """LLDB debugging utilities."""
 
+import hashlib
 import os
 import tempfile
+from pathlib import Path
 
 from xahaud_scripts.utils.logging import make_logger
 
 logger = make_logger(__name__)
 
+# Per-user, so another user can't plant commands for our lldb to run
+LLDB_SCRIPT_DIR = Path.home() / ".cache" / "xahaud-scripts"
+
 LLDB_SCRIPT = """
 # Set breakpoints for common crash conditions
 breakpoint set --name malloc_error_break
@@ -39,23 +44,30 @@ quit 1
 
 
 def create_lldb_script(all_threads: bool = False) -> str:
-    """Create a temporary file with LLDB commands.
+    """Return the path of a file holding the default LLDB commands.
+
+    The file is named after a hash of its content and kept in a per-user
+    cache dir, so it is written once and reused by every later run rather
+    than created and removed each time.
 
     Args:
         all_threads: If True, show backtrace for all threads. If False, only current thread.
 
     Returns:
-        Path to the temporary LLDB script file.
+        Path to the LLDB script file.
     """
-    fd, path = tempfile.mkstemp(suffix=".lldb")
-    logger.debug(
-        f"Creating temporary LLDB script at {path} (all_threads={all_threads})"
-    )
+    script = LLDB_SCRIPT_ALL_THREADS if all_threads else LLDB_SCRIPT
+    digest = hashlib.sha1(script.encode()).hexdigest()[:16]
+    path = LLDB_SCRIPT_DIR / f"lldb-{digest}.lldb"
+    if path.is_file():
+        logger.debug(f"Reusing LLDB script at {path} (all_threads={all_threads})")
+        return str(path)
 
+    logger.debug(f"Creating LLDB script at {path} (all_threads={all_threads})")
+    LLDB_SCRIPT_DIR.mkdir(parents=True, exist_ok=True)
+    # Write then rename, so a concurrent run never sees a partial file
+    fd, tmp = tempfile.mkstemp(suffix=".lldb", dir=LLDB_SCRIPT_DIR)
     with os.fdopen(fd, "w") as f:
-        if all_threads:
-            f.write(LLDB_SCRIPT_ALL_THREADS)
-        else:
-            f.write(LLDB_SCRIPT)
-
-    return path
+        f.write(script)
+    os.replace(tmp, path)
+    return str(path)
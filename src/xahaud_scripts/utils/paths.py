@@ -1,3 +1,4 @@
+import functools
 import os
 
 
@@ -8,7 +9,12 @@ def get_xahaud_root() -> str:
     if env_xahaud_root:
         return env_xahaud_root
 
-    cwd = os.getcwd()
+    return _find_xahaud_root(os.getcwd())
+
+
+@functools.cache
+def _find_xahaud_root(cwd: str) -> str:
+    # Cached per starting directory, so repeated lookups skip the stat walk
     while True:
         if os.path.exists(os.path.join(cwd, "CMakeLists.txt")) and os.path.exists(
             os.path.join(cwd, ".git")
@@ -1,9 +1,9 @@
+import functools
 import json
 import os
 import shutil
 import subprocess
 import sys
-from contextlib import contextmanager
 from pathlib import Path
 
 from xahaud_scripts.utils.logging import make_logger
@@ -11,8 +11,13 @@ from xahaud_scripts.utils.logging import make_logger
 logger = make_logger(__name__)
 
 
+@functools.cache
 def check_tool_exists(tool_name: str) -> bool:
-    """Check if a command-line tool exists."""
+    """Check if a command-line tool exists.
+
+    Cached for the life of the process, so each tool's PATH walk (and
+    its log line) happens once.
+    """
     exists = shutil.which(tool_name) is not None
     if exists:
         logger.debug(f"Tool '{tool_name}' is available")
@@ -48,11 +53,14 @@ def run_command(
     capture_output: bool = False,
     env: dict[str, str] | None = None,
     tee_file: Path | None = None,
+    cwd: str | Path | None = None,
 ) -> subprocess.CompletedProcess[str]:
     """Run a command and return the result.
 
     When tee_file is set (and capture_output is False), stdout+stderr are
     streamed to the terminal and appended to tee_file simultaneously.
+    Otherwise the child inherits our stdout/stderr directly. cwd runs the
+    command in another directory without touching our own.
     """
     cmd_str = json.dumps(cmd)
     logger.info(f"Running command: {cmd_str}")
@@ -60,7 +68,7 @@ def run_command(
     try:
         if capture_output:
             result = subprocess.run(
-                cmd, check=check, capture_output=True, text=True, env=env
+                cmd, check=check, capture_output=True, text=True, env=env, cwd=cwd
             )
             if result.stdout:
                 logger.debug(f"Command stdout: {result.stdout}")
@@ -71,19 +79,28 @@ def run_command(
 
         if tee_file is not None:
             tee_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(tee_file, "a") as tf:
+            # Copy raw bytes in whatever chunks the pipe yields: build logs
+            # run to hundreds of MB, and per-line decode/flush dominates.
+            sys.stdout.flush()
+            out = getattr(sys.stdout, "buffer", None)
+            with open(tee_file, "ab") as tf:
                 with subprocess.Popen(
                     cmd,
                     stdout=subprocess.PIPE,
                     stderr=subprocess.STDOUT,
-                    text=True,
                     env=env,
+                    cwd=cwd,
                 ) as proc:
                     assert proc.stdout is not None
-                    for line in proc.stdout:
-                        sys.stdout.write(line)
-                        sys.stdout.flush()
-                        tf.write(line)
+                    fd = proc.stdout.fileno()
+                    for chunk in iter(lambda: os.read(fd, 65536), b""):
+                        if out is not None:
+                            out.write(chunk)
+                            out.flush()
+                        else:
+                            sys.stdout.write(chunk.decode(errors="replace"))
+                            sys.stdout.flush()
+                        tf.write(chunk)
                         tf.flush()
                     proc.wait()
                 rc = proc.returncode
@@ -92,7 +109,7 @@ def run_command(
                 raise subprocess.CalledProcessError(rc, cmd)
             return subprocess.CompletedProcess(args=cmd, returncode=rc)
 
-        result = subprocess.run(cmd, check=check, env=env, text=True)
+        result = subprocess.run(cmd, check=check, env=env, text=True, cwd=cwd)
         logger.info(f"Command completed with return code: {result.returncode}")
         return result
 
@@ -115,31 +132,24 @@ def run_command(
         raise
 
 
+@functools.cache
 def get_logical_cpu_count() -> int:
-    """Get the number of logical CPUs."""
+    """Get the number of logical CPUs this process may run on.
+
+    Off macOS this honours the CPU affinity mask (e.g. a container's cpuset
+    or taskset), so build jobs don't oversubscribe a restricted machine.
+    Cached: on macOS each lookup would otherwise spawn sysctl.
+    """
     try:
         if sys.platform == "darwin":
             count = int(
                 subprocess.check_output(["sysctl", "-n", "hw.logicalcpu"]).strip()
             )
         else:
-            count = os.cpu_count() or 4  # Default to 4 if we can't determine
+            count = os.process_cpu_count() or 4  # Default to 4 if undetermined
 
         logger.debug(f"Detected {count} logical CPU cores")
         return count
     except Exception as e:
         logger.warning(f"Could not determine CPU count: {e}. Using default of 4.")
         return 4
-
-
-@contextmanager
-def change_directory(path: str):
-    """Context manager for changing directories safely."""
-    old_dir = os.getcwd()
-    logger.debug(f"Changing directory from {old_dir} to {path}")
-    try:
-        os.chdir(path)
-        yield
-    finally:
-        logger.debug(f"Changing directory back to {old_dir}")
-        os.chdir(old_dir)
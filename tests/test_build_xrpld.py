@@ -0,0 +1,168 @@
+"""Tests for xr-build helpers (build_xrpld.py)."""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+from rich.console import Console
+
+from xahaud_scripts import build_xrpld
+from xahaud_scripts.build_xrpld import (
+    TOOLCHAIN_CACHE_NAME,
+    _find_toolchain_file,
+    parse_diff_hunks,
+    show_uncovered_diff,
+)
+
+# --- _find_toolchain_file ---
+
+
+def test_find_toolchain_file_missing(tmp_path: Path):
+    assert _find_toolchain_file(tmp_path) is None
+    assert not (tmp_path / TOOLCHAIN_CACHE_NAME).exists()
+
+
+def test_find_toolchain_file_writes_cache(tmp_path: Path):
+    toolchain = tmp_path / "build" / "generators" / "conan_toolchain.cmake"
+    toolchain.parent.mkdir(parents=True)
+    toolchain.write_text("")
+
+    assert _find_toolchain_file(tmp_path) == toolchain
+    assert (tmp_path / TOOLCHAIN_CACHE_NAME).read_text() == str(toolchain)
+
+
+def test_find_toolchain_file_uses_cache_without_walk(tmp_path: Path, monkeypatch):
+    toolchain = tmp_path / "generators" / "conan_toolchain.cmake"
+    toolchain.parent.mkdir()
+    toolchain.write_text("")
+    (tmp_path / TOOLCHAIN_CACHE_NAME).write_text(f"{toolchain}\n")
+
+    def no_walk(self, pattern):
+        raise AssertionError("rglob should not run on a cache hit")
+
+    monkeypatch.setattr(Path, "rglob", no_walk)
+    assert _find_toolchain_file(tmp_path) == toolchain
+
+
+def test_find_toolchain_file_stale_cache_falls_back(tmp_path: Path):
+    (tmp_path / TOOLCHAIN_CACHE_NAME).write_text(str(tmp_path / "gone.cmake"))
+    toolchain = tmp_path / "conan_toolchain.cmake"
+    toolchain.write_text("")
+
+    assert _find_toolchain_file(tmp_path) == toolchain
+    assert (tmp_path / TOOLCHAIN_CACHE_NAME).read_text() == str(toolchain)
+
+
+# --- show_uncovered_diff (real git repo) ---
+
+
+@pytest.fixture
+def git_repo(tmp_path: Path):
+    """A throwaway git repo with a 'base' branch at the first commit."""
+    env = {
+        **os.environ,
+        "GIT_AUTHOR_NAME": "t",
+        "GIT_AUTHOR_EMAIL": "t@example.com",
+        "GIT_COMMITTER_NAME": "t",
+        "GIT_COMMITTER_EMAIL": "t@example.com",
+    }
+
+    def git(*args: str) -> None:
+        subprocess.run(
+            ["git", *args],
+            cwd=tmp_path,
+            env=env,
+            check=True,
+            capture_output=True,
+        )
+
+    git("init", "-q")
+    src = tmp_path / "src" / "foo.cpp"
+    src.parent.mkdir(parents=True)
+    src.write_text("".join(f"int l{i};\n" for i in range(1, 11)))
+    git("add", "-A")
+    git("commit", "-qm", "base")
+    git("branch", "base")
+    return tmp_path, git, src
+
+
+@pytest.fixture
+def captured(monkeypatch) -> Console:
+    console = Console(record=True, width=120, color_system=None)
+    monkeypatch.setattr(build_xrpld, "console", console)
+    return console
+
+
+def _write_report(path: Path, hits: dict[int, int]) -> Path:
+    path.write_text(
+        json.dumps(
+            {
+                "files": [
+                    {
+                        "file": "src/foo.cpp",
+                        "lines": [
+                            {"line_number": n, "count": c} for n, c in hits.items()
+                        ],
+                    }
+                ]
+            }
+        )
+    )
+    return path
+
+
+def test_parse_diff_hunks_parallel_arrays(git_repo):
+    repo, git, src = git_repo
+    lines = src.read_text().splitlines()
+    lines[1] = "int changed2;"
+    lines[2] = "int changed3;"
+    lines[6] = "int changed7;"
+    src.write_text("\n".join(lines) + "\n")
+    git("commit", "-qam", "change")
+
+    starts, ends = parse_diff_hunks("base", repo)["src/foo.cpp"]
+    assert list(zip(starts, ends, strict=True)) == [(2, 3), (7, 7)]
+
+
+def test_show_uncovered_diff_reports_uncovered_lines(git_repo, captured):
+    repo, git, src = git_repo
+    lines = src.read_text().splitlines()
+    lines[2] = "int changed3;"
+    lines[3] = "int changed4;"
+    lines[9] = "int changed10;"
+    src.write_text("\n".join(lines) + "\n")
+    git("commit", "-qam", "change")
+
+    report = _write_report(repo / "cov.json", {3: 1, 4: 0, 10: 0})
+    show_uncovered_diff("base", report, repo)
+
+    out = captured.export_text()
+    assert "src/foo.cpp (1/3 lines" in out
+    assert "L4" in out
+    assert "L10" in out
+    assert "int changed4;" in out
+    assert "int changed10;" in out
+    assert "Patch coverage: 1/3 (33.3%)" in out
+
+
+def test_show_uncovered_diff_fully_covered(git_repo, captured):
+    repo, git, src = git_repo
+    src.write_text(src.read_text().replace("int l5;", "int changed5;"))
+    git("commit", "-qam", "change")
+
+    report = _write_report(repo / "cov.json", {5: 3})
+    show_uncovered_diff("base", report, repo)
+
+    out = captured.export_text()
+    assert "src/foo.cpp" not in out
+    assert "Patch coverage: 1/1 (100.0%)" in out
+
+
+def test_ccache_sloppiness_is_shared_with_x_run_tests():
+    from xahaud_scripts.build import ccache
+
+    assert build_xrpld.CCACHE_SLOPPINESS is ccache.CCACHE_SLOPPINESS
@@ -0,0 +1,233 @@
+"""Tests for CMake configure command assembly (build/cmake.py)."""
+
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from xahaud_scripts.build import cmake
+from xahaud_scripts.build.ccache import CCACHE_SLOPPINESS, get_ccache_env
+from xahaud_scripts.build.cmake import CMakeOptions, cmake_configure
+from xahaud_scripts.build.config import detect_previous_build_config
+
+
+@pytest.fixture
+def ninja_available(monkeypatch):
+    monkeypatch.setattr(cmake, "check_tool_exists", lambda tool: tool == "ninja")
+
+
+def _configure_output(build_dir: Path, capsys, generator: str | None = None) -> str:
+    options = CMakeOptions(use_conan=False, generator=generator)
+    assert cmake_configure(str(build_dir), options, dry_run=True)
+    return capsys.readouterr().out
+
+
+def test_detects_previous_generator(tmp_path: Path):
+    assert detect_previous_build_config(str(tmp_path))["generator"] is None
+    (tmp_path / "CMakeCache.txt").write_text(
+        "CMAKE_BUILD_TYPE:STRING=Release\nCMAKE_GENERATOR:INTERNAL=Unix Makefiles\n"
+    )
+    assert detect_previous_build_config(str(tmp_path))["generator"] == "Unix Makefiles"
+
+
+def test_configure_uses_ninja_for_new_build_dir(
+    tmp_path: Path, ninja_available, capsys
+):
+    out = _configure_output(tmp_path / "build", capsys)
+    assert "-G \\\n" in out
+    assert "Ninja" in out
+
+
+def test_configure_keeps_existing_generator(tmp_path: Path, ninja_available, capsys):
+    (tmp_path / "CMakeCache.txt").write_text(
+        "CMAKE_GENERATOR:INTERNAL=Unix Makefiles\n"
+    )
+    out = _configure_output(tmp_path, capsys)
+    assert "-G" not in out
+    assert "Ninja" not in out
+
+
+def test_configure_explicit_generator(tmp_path: Path, monkeypatch, capsys):
+    monkeypatch.setattr(cmake, "check_tool_exists", lambda tool: False)
+    assert "-G" not in _configure_output(tmp_path / "build", capsys)
+    out = _configure_output(tmp_path / "build", capsys, generator="Unix Makefiles")
+    assert "Unix Makefiles" in out
+
+
+def _build_output(build_dir: Path, capsys, parallel: int | None = None) -> str:
+    assert cmake.cmake_build(str(build_dir), parallel=parallel, dry_run=True)
+    return capsys.readouterr().out
+
+
+def test_build_leaves_job_count_to_ninja(tmp_path: Path, monkeypatch, capsys):
+    monkeypatch.delenv("CMAKE_BUILD_PARALLEL_LEVEL", raising=False)
+    (tmp_path / "CMakeCache.txt").write_text("CMAKE_GENERATOR:INTERNAL=Ninja\n")
+    assert "--parallel" not in _build_output(tmp_path, capsys)
+    assert "--parallel 3" in _build_output(tmp_path, capsys, parallel=3)
+
+
+def test_build_passes_cpu_count_to_make(tmp_path: Path, monkeypatch, capsys):
+    monkeypatch.delenv("CMAKE_BUILD_PARALLEL_LEVEL", raising=False)
+    monkeypatch.setattr(cmake, "get_logical_cpu_count", lambda: 7)
+    (tmp_path / "CMakeCache.txt").write_text(
+        "CMAKE_GENERATOR:INTERNAL=Unix Makefiles\n"
+    )
+    assert "--parallel 7" in _build_output(tmp_path, capsys)
+    monkeypatch.setenv("CMAKE_BUILD_PARALLEL_LEVEL", "5")
+    assert "--parallel" not in _build_output(tmp_path, capsys)
+
+
+def test_configure_wires_ccache_launcher(tmp_path: Path, monkeypatch, capsys):
+    monkeypatch.setattr(cmake, "check_tool_exists", lambda tool: tool == "ccache")
+    monkeypatch.setattr(cmake, "setup_ccache_config", lambda dry_run: None)
+    monkeypatch.delenv("CCACHE_DISABLE", raising=False)
+    options = CMakeOptions(use_conan=False, ccache=True, ccache_sloppy=True)
+    assert cmake_configure(str(tmp_path), options, dry_run=True)
+    out = capsys.readouterr().out
+    assert "-DCMAKE_CXX_COMPILER_LAUNCHER=env" in out
+    assert f"CCACHE_SLOPPINESS={CCACHE_SLOPPINESS}" in out
+    assert get_ccache_env(sloppy=True)["CCACHE_SLOPPINESS"] == CCACHE_SLOPPINESS
+
+    monkeypatch.setenv("CCACHE_DISABLE", "1")
+    assert cmake_configure(str(tmp_path), options, dry_run=True)
+    assert "COMPILER_LAUNCHER" not in capsys.readouterr().out
+
+
+def test_build_ccache_remote_storage(tmp_path: Path, monkeypatch, capsys):
+    monkeypatch.setattr(cmake, "check_tool_exists", lambda tool: tool == "ccache")
+    url = "redis://:secret@cache:6379"
+    assert cmake.cmake_build(
+        str(tmp_path), ccache=True, ccache_remote_storage=url, dry_run=True
+    )
+    out = capsys.readouterr().out
+    assert "CCACHE_REMOTE_STORAGE=<set>" in out
+    assert "secret" not in out
+
+    env = get_ccache_env(remote_storage=url)
+    assert env["CCACHE_REMOTE_STORAGE"] == url
+    assert env["CCACHE_REMOTE_ONLY"] == "false"
+
+
+def test_llvm_coverage_profile_list(tmp_path: Path, capsys):
+    options = CMakeOptions(
+        use_conan=False,
+        coverage=True,
+        coverage_impl="llvm-injected",
+        coverage_exclude=["*/src/test/*"],
+    )
+    assert cmake_configure(str(tmp_path), options, dry_run=True)
+    assert not list(tmp_path.glob("coverage_profile-*.list"))  # dry run
+
+    profile_list = cmake.write_coverage_profile_list(
+        str(tmp_path), [], ["*/src/test/*"]
+    )
+    assert f"-fprofile-list={profile_list}" in capsys.readouterr().out
+    content = profile_list.read_text()
+    assert "source:*/.conan2/*=skip" in content
+    assert "source:*/src/test/*=skip" in content
+    assert "src:" not in content  # would make clang's default forbid
+    assert content.endswith("default:allow\n")
+
+    # A different list gets a different name, so ccache can't reuse objects.
+    other = cmake.write_coverage_profile_list(str(tmp_path), ["*/src/ripple/*"], [])
+    assert other != profile_list
+    assert other.read_text().endswith("source:*/src/ripple/*=allow\ndefault:skip\n")
+
+
+@pytest.mark.skipif(
+    not (shutil.which("clang") and shutil.which("llvm-profdata")),
+    reason="needs clang and llvm-profdata",
+)
+@pytest.mark.parametrize(
+    ("include", "exclude", "expected"),
+    [
+        ([], [], {"main", "kept", "dropped"}),
+        ([], ["*/dropped.c"], {"main", "kept"}),
+        (["*/main.c", "*/kept.c"], [], {"main", "kept"}),
+        # allow is checked before skip, so the include wins.
+        (["*/main.c", "*/dropped.c"], ["*/dropped.c"], {"main", "dropped"}),
+    ],
+)
+def test_llvm_coverage_profile_list_with_clang(
+    tmp_path: Path, include: list[str], exclude: list[str], expected: set[str]
+):
+    sources = {
+        "main.c": "int kept(void);\nint dropped(void);\n"
+        "int main(void) { return kept() + dropped(); }\n",
+        "kept.c": "int kept(void) { return 0; }\n",
+        "dropped.c": "int dropped(void) { return 0; }\n",
+    }
+    for name, text in sources.items():
+        (tmp_path / name).write_text(text)
+    profile_list = cmake.write_coverage_profile_list(str(tmp_path), include, exclude)
+
+    stub = tmp_path / "stub"
+    subprocess.run(
+        [
+            "clang",
+            "-fprofile-instr-generate",
+            "-fcoverage-mapping",
+            f"-fprofile-list={profile_list}",
+            *(str(tmp_path / name) for name in sources),
+            "-o",
+            str(stub),
+        ],
+        check=True,
+    )
+    profraw = tmp_path / "stub.profraw"
+    subprocess.run(
+        [str(stub)], env={**os.environ, "LLVM_PROFILE_FILE": str(profraw)}, check=True
+    )
+    profdata = tmp_path / "stub.profdata"
+    subprocess.run(
+        ["llvm-profdata", "merge", "-o", str(profdata), str(profraw)], check=True
+    )
+    shown = subprocess.run(
+        ["llvm-profdata", "show", "--all-functions", str(profdata)],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+    instrumented = {
+        name for name in ("main", "kept", "dropped") if f"  {name}:" in shown
+    }
+    assert instrumented == expected
+
+
+def test_detect_previous_build_config_reads_cache(tmp_path: Path):
+    (tmp_path / "CMakeCache.txt").write_text(
+        "# This is the CMakeCache file.\n"
+        "CMAKE_BUILD_TYPE:STRING=Release\n"
+        "CMAKE_CXX_COMPILER_LAUNCHER:STRING=env CCACHE_CONFIGPATH=/x ccache\n"
+        "CMAKE_CXX_FLAGS:STRING=-fsanitize=undefined\n"
+        "CMAKE_TOOLCHAIN_FILE:FILEPATH=/b/ccache_wrapper_toolchain.cmake\n"
+        "CONAN_TOOLCHAIN:INTERNAL=/b/build/generators/conan_toolchain.cmake\n"
+        "CMAKE_GENERATOR:INTERNAL=Ninja\n"
+    )
+    assert detect_previous_build_config(str(tmp_path)) == {
+        "coverage": False,
+        "conan": True,
+        "verbose": False,
+        "ccache": True,
+        "ubsan": True,
+        "stdlib_hardening": False,
+        "build_type": "Release",
+        "generator": "Ninja",
+    }
+
+
+def test_llvm_coverage_opt_level(tmp_path: Path, capsys):
+    for level in (0, 1):
+        options = CMakeOptions(
+            use_conan=False,
+            coverage=True,
+            coverage_impl="llvm-injected",
+            coverage_opt_level=level,
+        )
+        assert cmake_configure(str(tmp_path), options, dry_run=True)
+        assert f"-DCMAKE_CXX_FLAGS=-O{level} -fcoverage-mapping" in (
+            capsys.readouterr().out
+        )
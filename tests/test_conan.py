@@ -1,6 +1,15 @@
 """Tests for the conan `date` OS-tzdb option discriminator (conan.py)."""
 
-from xahaud_scripts.build.conan import _pick_date_tz_option
+from pathlib import Path
+
+from xahaud_scripts.build import conan
+from xahaud_scripts.build.conan import (
+    CONAN_STAMP_NAME,
+    _pick_date_tz_option,
+    conan_install,
+    conan_install_fingerprint,
+    conan_install_is_current,
+)
 
 
 def _graph(date_options: dict) -> dict:
@@ -55,3 +64,56 @@ def test_empty_or_malformed_graph_returns_empty():
     assert _pick_date_tz_option({}) == []
     assert _pick_date_tz_option({"graph": {}}) == []
     assert _pick_date_tz_option({"graph": {"nodes": {}}}) == []
+
+
+# --- conan install stamp ---
+
+
+def _conan_tree(tmp_path: Path, monkeypatch) -> tuple[Path, Path]:
+    root = tmp_path / "xahaud"
+    root.mkdir()
+    (root / "conanfile.py").write_text("requires = ['date/3.0.3']\n")
+    home = tmp_path / "conan-home"
+    (home / "profiles").mkdir(parents=True)
+    (home / "profiles" / "default").write_text("[settings]\nos=Linux\n")
+    monkeypatch.setenv("CONAN_HOME", str(home))
+    return root, home
+
+
+def test_fingerprint_tracks_recipe_profile_and_build_type(tmp_path: Path, monkeypatch):
+    root, home = _conan_tree(tmp_path, monkeypatch)
+    base = conan_install_fingerprint(str(root), "Debug")
+    assert conan_install_fingerprint(str(root), "Debug") == base
+    assert conan_install_fingerprint(str(root), "Release") != base
+
+    (home / "profiles" / "default").write_text("[settings]\nos=Macos\n")
+    changed_profile = conan_install_fingerprint(str(root), "Debug")
+    assert changed_profile != base
+
+    (root / "conanfile.py").write_text("requires = ['date/3.0.4']\n")
+    assert conan_install_fingerprint(str(root), "Debug") != changed_profile
+
+
+def test_install_is_current_needs_stamp_and_toolchain(tmp_path: Path):
+    build = tmp_path / "build"
+    build.mkdir()
+    assert not conan_install_is_current(str(build), "abc")
+
+    (build / CONAN_STAMP_NAME).write_text("abc\n")
+    assert not conan_install_is_current(str(build), "abc")  # no toolchain yet
+
+    toolchain = build / "build" / "generators" / "conan_toolchain.cmake"
+    toolchain.parent.mkdir(parents=True)
+    toolchain.write_text("")
+    assert conan_install_is_current(str(build), "abc")
+    assert not conan_install_is_current(str(build), "def")
+
+
+def test_install_dry_run_downloads_in_parallel(tmp_path: Path, monkeypatch, capsys):
+    root, home = _conan_tree(tmp_path, monkeypatch)
+    monkeypatch.setattr(conan, "check_conan_available", lambda: True)
+    monkeypatch.setattr(conan, "get_logical_cpu_count", lambda: 6)
+    assert conan_install(str(root), build_dir=str(tmp_path / "b"), dry_run=True)
+    out = capsys.readouterr().out
+    assert "conan install -c core.download:parallel=6" in out
+    assert "-c core:non_interactive=True" in out
@@ -12,7 +12,9 @@ import pytest
 from xahaud_scripts.utils.coverage_diff import (
     DiffCoverageResult,
     DiffCoverageSummary,
+    _fresh_full_report,
     _group_lines_with_context,
+    _newest_gcda_mtime,
     _parse_gcovr_line_coverage,
     compute_diff_coverage,
     parse_diff_hunks,
@@ -319,3 +321,32 @@ def test_parse_diff_hunks_ignores_pure_deletions(git_repo):
 def test_parse_diff_hunks_returns_empty_on_git_failure(git_repo):
     repo, _git, _src = git_repo
     assert parse_diff_hunks("no-such-ref", str(repo)) == {}
+
+
+# --- _fresh_full_report ---
+
+
+def test_newest_gcda_mtime(tmp_path: Path):
+    assert _newest_gcda_mtime(tmp_path) is None
+    for name, mtime in (("a/x.gcda", 100), ("a/b/y.gcda", 300), ("z.gcno", 900)):
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text("")
+        os.utime(tmp_path / name, (mtime, mtime))
+    assert _newest_gcda_mtime(tmp_path) == 300
+
+
+def test_fresh_full_report_reused_only_when_newer(tmp_path: Path):
+    assert _fresh_full_report(str(tmp_path)) is None
+    report = tmp_path / "coverage" / "coverage.json"
+    report.parent.mkdir()
+    report.write_text("{}")
+    gcda = tmp_path / "obj" / "x.gcda"
+    gcda.parent.mkdir()
+    gcda.write_text("")
+
+    os.utime(report, (200, 200))
+    os.utime(gcda, (100, 100))
+    assert _fresh_full_report(str(tmp_path)) == report
+
+    os.utime(gcda, (300, 300))  # tests ran again after the report
+    assert _fresh_full_report(str(tmp_path)) is None
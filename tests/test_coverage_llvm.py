@@ -0,0 +1,28 @@
+"""Tests for LLVM-injected coverage helpers (utils/coverage_llvm.py)."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from xahaud_scripts.utils.coverage_llvm import _find_profraw_files
+
+
+def test_find_profraw_files_prefers_build_dir(tmp_path: Path, monkeypatch):
+    top = tmp_path / "rippled-123_0.profraw"
+    top.write_text("")
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "nested.profraw").write_text("")
+
+    def no_walk(self, pattern):
+        raise AssertionError("rglob should not run when the build dir has hits")
+
+    with monkeypatch.context() as m:
+        m.setattr(Path, "rglob", no_walk)
+        assert _find_profraw_files(str(tmp_path)) == [top]
+
+    top.unlink()
+    assert _find_profraw_files(str(tmp_path)) == [tmp_path / "src" / "nested.profraw"]
+
+
+def test_find_profraw_files_none(tmp_path: Path):
+    assert _find_profraw_files(str(tmp_path)) == []
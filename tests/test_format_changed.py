@@ -0,0 +1,208 @@
+"""Tests for x-format-changed file discovery (format_changed.py)."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from xahaud_scripts import format_changed
+from xahaud_scripts.format_changed import (
+    _arg_chunks,
+    _parse_porcelain_z,
+    get_all_files_by_type,
+    get_git_dirty_files,
+)
+
+# --- _arg_chunks ---
+
+
+def test_arg_chunks_single_batch():
+    paths = [Path(f"src/f{i}.cpp") for i in range(10)]
+    assert _arg_chunks(paths, reserved=100) == [paths]
+
+
+def test_arg_chunks_splits_at_budget(monkeypatch):
+    # Budget is half of ARG_MAX minus the reserved prefix: 200 // 2 - 10 = 90.
+    monkeypatch.setattr(format_changed.os, "sysconf", lambda name: 200)
+    paths = [Path(f"src/file{i:02}.cpp") for i in range(6)]  # 23 bytes each
+    chunks = _arg_chunks(paths, reserved=10)
+    assert chunks == [paths[0:3], paths[3:6]]
+    assert _arg_chunks([], reserved=10) == []
+
+
+# --- get_all_files_by_type ---
+
+
+def test_get_all_files_by_type_single_walk(tmp_path: Path):
+    for rel in [
+        "src/a/x.cpp",
+        "src/a/x.h",
+        "src/run.sh",
+        "src/gen.py",
+        "src/CMakeLists.txt",
+        "src/__pycache__/gen.cpython-313.py",
+        "Builds/CMake/deps.cmake",
+        "setup.py",
+        "nested/deep.py",  # root is not recursed
+        "README.md",
+    ]:
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text("")
+
+    files = get_all_files_by_type(tmp_path)
+    rel = {k: sorted(str(p.relative_to(tmp_path)) for p in v) for k, v in files.items()}
+    assert rel == {
+        "cpp": ["src/a/x.cpp", "src/a/x.h"],
+        "shell": ["src/run.sh"],
+        "python": ["setup.py", "src/gen.py"],
+        "cmake": ["Builds/CMake/deps.cmake", "src/CMakeLists.txt"],
+    }
+
+
+# --- _parse_porcelain_z ---
+
+
+def test_parse_porcelain_z_basic():
+    out = b"M  src/a.cpp\0 M src/b.h\0?? new.py\0"
+    assert _parse_porcelain_z(out) == {"src/a.cpp", "src/b.h", "new.py"}
+
+
+def test_parse_porcelain_z_skips_rename_source():
+    out = b"R  src/new.cpp\0src/old.cpp\0A  x.sh\0"
+    assert _parse_porcelain_z(out) == {"src/new.cpp", "x.sh"}
+
+
+def test_parse_porcelain_z_drops_deleted():
+    out = b"D  src/gone.cpp\0 D src/gone.h\0AD src/tmp.py\0M  keep.sh\0"
+    assert _parse_porcelain_z(out) == {"keep.sh"}
+
+
+def test_parse_porcelain_z_empty():
+    assert _parse_porcelain_z(b"") == set()
+
+
+def test_parse_porcelain_z_unquoted_odd_names():
+    # -z output is never C-quoted; undecodable bytes survive via surrogateescape.
+    out = b"?? src/with space.cpp\0?? src/caf\xe9.h\0"
+    files = _parse_porcelain_z(out)
+    assert "src/with space.cpp" in files
+    assert os.fsencode(next(f for f in files if f.endswith(".h"))) == (b"src/caf\xe9.h")
+
+
+# --- get_git_dirty_files (real git repo) ---
+
+
+@pytest.fixture
+def git_repo(tmp_path: Path, monkeypatch):
+    """A throwaway git repo with one committed file per formatter type."""
+    env = {
+        **os.environ,
+        "GIT_AUTHOR_NAME": "t",
+        "GIT_AUTHOR_EMAIL": "t@example.com",
+        "GIT_COMMITTER_NAME": "t",
+        "GIT_COMMITTER_EMAIL": "t@example.com",
+    }
+
+    def git(*args: str) -> None:
+        subprocess.run(
+            ["git", *args],
+            cwd=tmp_path,
+            env=env,
+            check=True,
+            capture_output=True,
+        )
+
+    git("init", "-q")
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "a.cpp").write_text("int a;\n")
+    (tmp_path / "src" / "gone.h").write_text("int g;\n")
+    (tmp_path / "tool.py").write_text("x = 1\n")
+    (tmp_path / "other").mkdir()
+    (tmp_path / "other" / "skip.cpp").write_text("int s;\n")
+    git("add", "-A")
+    git("commit", "-qm", "base")
+    git("branch", "base")
+    # Run from elsewhere: the function must not depend on (or change) cwd.
+    monkeypatch.chdir(tmp_path / "src")
+    return tmp_path, git
+
+
+def test_get_git_dirty_files_staged_unstaged_untracked(git_repo):
+    repo, git = git_repo
+    (repo / "src" / "a.cpp").write_text("int a2;\n")  # unstaged
+    (repo / "tool.py").write_text("x = 2\n")
+    git("add", "tool.py")  # staged
+    (repo / "src" / "new").mkdir()
+    (repo / "src" / "new" / "b.sh").write_text("echo\n")  # untracked, new dir
+    (repo / "other" / "skip.cpp").write_text("int s2;\n")  # outside SEARCH_DIRS
+    (repo / "src" / "gone.h").unlink()  # deleted
+
+    files = get_git_dirty_files(repo)
+    assert Path.cwd() == repo / "src"
+    assert files["cpp"] == [repo / "src" / "a.cpp"]
+    assert files["python"] == [repo / "tool.py"]
+    assert files["shell"] == [repo / "src" / "new" / "b.sh"]
+    assert files["cmake"] == []
+
+
+def test_get_git_dirty_files_since_base(git_repo):
+    repo, git = git_repo
+    (repo / "CMakeLists.txt").write_text("project(x)\n")
+    (repo / "src" / "gone.h").unlink()
+    git("add", "-A")
+    (repo / "src" / "later.sh").write_text("echo\n")
+    git("add", "-A")
+    git("commit", "-qm", "change")
+    (repo / "src" / "later.sh").unlink()  # in the diff, gone from the tree
+
+    files = get_git_dirty_files(repo, since_base="base")
+    assert files["cmake"] == [repo / "CMakeLists.txt"]
+    assert files["cpp"] == []
+    assert files["shell"] == []
+
+
+# --- per-file error reporting and staging ---
+
+
+def test_bad_file_does_not_block_good_ones(git_repo, monkeypatch, tmp_path_factory):
+    repo, git = git_repo
+    # Fake ruff: normalises each file, but fails (after doing the rest, like
+    # ruff) on any file it cannot parse.
+    fake = tmp_path_factory.mktemp("bin") / "ruff"
+    fake.write_text(
+        "#!/bin/sh\n"
+        "shift\n"  # "format"
+        "rc=0\n"
+        'for f in "$@"; do\n'
+        '  if grep -q "def (" "$f"; then rc=2; else echo "x = 3" > "$f"; fi\n'
+        "done\n"
+        "exit $rc\n"
+    )
+    fake.chmod(0o755)
+    (repo / "tool.py").write_text("x=2\n")
+    (repo / "src" / "good.py").write_text("y=1\n")
+    (repo / "src" / "bad.py").write_text("def (\n")
+
+    monkeypatch.setattr(format_changed, "_RUFF", fake)
+    monkeypatch.setattr(format_changed, "_check_venv_tool", lambda tool: None)
+    monkeypatch.setattr(format_changed, "get_xahaud_root", lambda: str(repo))
+    monkeypatch.setattr(
+        format_changed.sys, "argv", ["x-format-changed", "--python-only", "--stage"]
+    )
+    with pytest.raises(SystemExit) as exc:
+        format_changed.main()
+    assert exc.value.code == 1
+
+    staged = subprocess.run(
+        ["git", "diff", "--cached", "--name-only"],
+        cwd=repo,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+    assert sorted(staged) == ["src/good.py", "tool.py"]
+    assert (repo / "src" / "good.py").read_text() == "x = 3\n"
+    assert (repo / "src" / "bad.py").read_text() == "def (\n"
@@ -0,0 +1,225 @@
+"""Tests for the GitHub Actions job fetcher (get_job.py)."""
+
+from __future__ import annotations
+
+import pytest
+from click.testing import CliRunner
+
+from xahaud_scripts.get_job import GitHubActionsFetcher, _parse_step_marker, main
+
+JOB_URL = "https://github.com/Xahau/xahaud/actions/runs/123/job/456"
+
+SAMPLE_LOG = "\n".join(
+    [
+        "2024-01-01T00:00:00.0000000Z ##[group]Operating System",
+        "2024-01-01T00:00:00.0000001Z Ubuntu",
+        "2024-01-01T00:00:00.0000002Z ##[endgroup]",
+        "2024-01-01T00:00:01.0000000Z ##[group]Starting: Checkout",
+        "2024-01-01T00:00:01.0000001Z fetching",
+        "2024-01-01T00:00:01.0000002Z done",
+        "2024-01-01T00:00:03.0000000Z ##[group]Starting: Build",
+        "2024-01-01T00:00:03.0000001Z compiling",
+    ]
+)
+
+
+@pytest.fixture
+def fetcher() -> GitHubActionsFetcher:
+    return GitHubActionsFetcher(JOB_URL)
+
+
+def test_parse_github_url(fetcher: GitHubActionsFetcher):
+    assert (fetcher.owner, fetcher.repo) == ("Xahau", "xahaud")
+    assert (fetcher.run_id, fetcher.job_id) == ("123", "456")
+
+
+def test_parse_github_url_repo_only_with_query():
+    f = GitHubActionsFetcher("https://github.com/Xahau/xahaud?tab=actions")
+    assert (f.owner, f.repo, f.run_id, f.job_id) == ("Xahau", "xahaud", None, None)
+
+
+@pytest.mark.parametrize(
+    ("start", "end", "expected"),
+    [
+        ("2024-01-01T00:00:00Z", "2024-01-01T00:00:01.5Z", "1.50s"),
+        ("2024-01-01T00:00:00Z", "2024-01-01T00:02:05Z", "2m 5s"),
+        ("2024-01-01T00:00:00Z", "2024-01-01T01:30:00Z", "1h 30m"),
+        (None, "2024-01-01T00:00:00Z", "N/A"),
+        ("garbage", "2024-01-01T00:00:00Z", "N/A"),
+    ],
+)
+def test_format_duration(fetcher: GitHubActionsFetcher, start, end, expected):
+    assert fetcher._format_duration(start, end) == expected
+
+
+def test_extract_step_logs(fetcher: GitHubActionsFetcher):
+    steps = fetcher._extract_step_logs(SAMPLE_LOG.splitlines())
+    assert list(steps) == ["Checkout", "Build"]
+    assert steps["Checkout"] == (
+        "2024-01-01T00:00:01.0000001Z fetching\n2024-01-01T00:00:01.0000002Z done"
+    )
+    assert steps["Build"] == "2024-01-01T00:00:03.0000001Z compiling"
+
+
+def test_extract_step_logs_closing_marker_keeps_output(fetcher: GitHubActionsFetcher):
+    lines = [
+        "##[group]Starting: Checkout",
+        "fetching",
+        "##[group]Finishing: Checkout",
+        "cleanup noise",
+        "##[group]Starting: Build",
+        "compiling",
+    ]
+    steps = fetcher._extract_step_logs(lines)
+    assert steps == {"Checkout": "fetching", "Build": "compiling"}
+
+
+@pytest.mark.parametrize(
+    ("line", "expected"),
+    [
+        ("##[group]Starting: Build", ("Starting", "Build")),
+        (
+            "2024-01-01T00:00:00Z ##[group]Finishing: Run tests ",
+            ("Finishing", "Run tests"),
+        ),
+        ("##[group]Pre Running: Starting: x", ("Running", "Starting: x")),
+        ("##[group]Operating System", None),
+        ("Starting: not a marker", None),
+        ("plain", None),
+    ],
+)
+def test_parse_step_marker(line, expected):
+    assert _parse_step_marker(line) == expected
+
+
+def test_extract_step_logs_no_markers(fetcher: GitHubActionsFetcher):
+    assert fetcher._extract_step_logs(["plain", "log"]) == {}
+
+
+class FakeResponse:
+    """Minimal streaming stand-in for requests.Response."""
+
+    def __init__(self, body: str) -> None:
+        self.body = body
+        self.encoding: str | None = None
+        self.headers = {"Content-Type": "text/plain"}
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def iter_lines(self, chunk_size: int, decode_unicode: bool):
+        assert decode_unicode and self.encoding == "utf-8"
+        yield from self.body.splitlines()
+
+    def __enter__(self) -> FakeResponse:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        pass
+
+
+def test_get_job_logs_streams_lines(fetcher: GitHubActionsFetcher, monkeypatch):
+    calls: list[dict] = []
+
+    def fake_get(url: str, **kwargs):
+        calls.append(kwargs)
+        return FakeResponse(SAMPLE_LOG)
+
+    monkeypatch.setattr(fetcher._session, "get", fake_get)
+    steps = fetcher._extract_step_logs(fetcher.get_job_logs("456"))
+    assert list(steps) == ["Checkout", "Build"]
+    assert calls[0]["stream"] is True
+
+
+def test_get_job_details_caches_completed_jobs(
+    fetcher: GitHubActionsFetcher, monkeypatch, tmp_path
+):
+    monkeypatch.setattr("xahaud_scripts.get_job.JOB_CACHE_DIR", tmp_path)
+    calls: list[str] = []
+
+    def fake_request(url: str) -> dict:
+        calls.append(url)
+        return {"id": 456, "status": "completed", "steps": []}
+
+    monkeypatch.setattr(fetcher, "_make_request", fake_request)
+    assert fetcher.get_job_details("456")["id"] == 456
+    assert fetcher.get_job_details("456")["id"] == 456
+    assert len(calls) == 1  # memoized in-process
+
+    # A fresh fetcher reads the completed job back from disk.
+    other = GitHubActionsFetcher(JOB_URL)
+    monkeypatch.setattr(other, "_make_request", fake_request)
+    assert other.get_job_details("456")["status"] == "completed"
+    assert len(calls) == 1
+
+
+def test_get_job_details_does_not_persist_running_jobs(
+    fetcher: GitHubActionsFetcher, monkeypatch, tmp_path
+):
+    monkeypatch.setattr("xahaud_scripts.get_job.JOB_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(
+        fetcher, "_make_request", lambda url: {"id": 456, "status": "in_progress"}
+    )
+    fetcher.get_job_details("456")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_main_run_url_prints_jobs_in_order(monkeypatch):
+    jobs = [
+        {"id": n, "name": f"job{n}", "steps": [{"name": "Build", "number": 1}]}
+        for n in (1, 2, 3)
+    ]
+    monkeypatch.setattr(GitHubActionsFetcher, "get_run_jobs", lambda self, rid: jobs)
+    monkeypatch.setattr(
+        GitHubActionsFetcher,
+        "get_job_logs",
+        lambda self, job_id: iter(
+            ["##[group]Starting: Build", f"output of job {job_id}"]
+        ),
+    )
+    result = CliRunner().invoke(
+        main, ["https://github.com/o/r/actions/runs/9", "--all-logs"]
+    )
+    assert result.exit_code == 0, result.output
+    out = result.output
+    assert out.index("job1") < out.index("job2") < out.index("job3")
+    assert "output of job 3" in out
+
+
+def test_main_only_fetches_logs_for_failed_jobs(monkeypatch):
+    jobs = [
+        {
+            "id": n,
+            "name": f"job{n}",
+            "steps": [{"name": "Build", "number": 1, "conclusion": conclusion}],
+        }
+        for n, conclusion in ((1, "success"), (2, "failure"), (3, "timed_out"))
+    ]
+    fetched: list[str] = []
+
+    def fake_logs(self, job_id: str):
+        fetched.append(job_id)
+        return iter(["##[group]Starting: Build", f"output of job {job_id}"])
+
+    monkeypatch.setattr(GitHubActionsFetcher, "get_run_jobs", lambda self, rid: jobs)
+    monkeypatch.setattr(GitHubActionsFetcher, "get_job_logs", fake_logs)
+    result = CliRunner().invoke(main, ["https://github.com/o/r/actions/runs/9"])
+    assert result.exit_code == 0, result.output
+    assert sorted(fetched) == ["2", "3"]
+    assert "output of job 1" not in result.output
+    assert "output of job 2" in result.output
+
+
+@pytest.mark.parametrize("n", [1, 50])
+def test_truncate_log_short_is_unchanged(n: int):
+    text = "\n".join(f"line {i}" for i in range(n))
+    assert GitHubActionsFetcher._truncate_log(text) == text
+
+
+def test_truncate_log_keeps_head_and_tail():
+    lines = [f"line {i}" for i in range(51)]
+    out = GitHubActionsFetcher._truncate_log("\n".join(lines))
+    expected = (
+        "\n".join(lines[:20]) + "\n\n... 11 more lines ...\n\n" + "\n".join(lines[-20:])
+    )
+    assert out == expected
@@ -0,0 +1,185 @@
+"""Tests for running the rippled test binary (run_tests.py)."""
+
+import os
+import subprocess
+from concurrent.futures import Future
+from pathlib import Path
+
+import pytest
+
+from xahaud_scripts import run_tests
+from xahaud_scripts.run_tests import (
+    _remove_files,
+    _write_step_outputs,
+    do_build_jshooks_header,
+    do_compile_test_hooks,
+    run_rippled,
+)
+
+
+def _fake_rippled(build_dir: Path, exit_code: int = 0) -> Path:
+    binary = build_dir / "rippled"
+    binary.write_text(
+        f'#!/bin/sh\necho "$0 $*" >> "$(dirname "$0")/calls"\nexit {exit_code}\n'
+    )
+    binary.chmod(0o755)
+    return binary
+
+
+def test_run_rippled_missing_binary(tmp_path: Path):
+    (tmp_path / "rippled").write_text("not executable")
+    assert run_rippled(["suite"], use_lldb=False, build_dir=str(tmp_path)) == 1
+
+
+def test_run_rippled_runs_by_absolute_path(tmp_path: Path):
+    binary = _fake_rippled(tmp_path)
+    assert run_rippled(["suite"], use_lldb=False, times=2, build_dir=str(tmp_path)) == 0
+    calls = (tmp_path / "calls").read_text().splitlines()
+    assert calls == [f"{binary} -u suite"] * 2
+
+
+def test_run_rippled_stops_on_fail(tmp_path: Path):
+    _fake_rippled(tmp_path, exit_code=1)
+    assert run_rippled(["suite"], use_lldb=False, times=3, build_dir=str(tmp_path)) == 1
+    assert len((tmp_path / "calls").read_text().splitlines()) == 1
+
+
+def test_lldb_script_is_written_once(tmp_path: Path, monkeypatch):
+    from xahaud_scripts.utils import lldb
+
+    monkeypatch.setattr(lldb, "LLDB_SCRIPT_DIR", tmp_path / "cache")
+    path = lldb.create_lldb_script(all_threads=True)
+    assert Path(path).read_text() == lldb.LLDB_SCRIPT_ALL_THREADS
+    mtime = Path(path).stat().st_mtime_ns
+
+    assert lldb.create_lldb_script(all_threads=True) == path
+    assert Path(path).stat().st_mtime_ns == mtime
+    assert lldb.create_lldb_script(all_threads=False) != path
+    assert len(list((tmp_path / "cache").iterdir())) == 2
+
+
+def test_run_rippled_passes_unittest_jobs(tmp_path: Path):
+    binary = _fake_rippled(tmp_path)
+    assert (
+        run_rippled(["suite"], use_lldb=False, build_dir=str(tmp_path), unittest_jobs=4)
+        == 0
+    )
+    calls = (tmp_path / "calls").read_text().splitlines()
+    assert calls == [f"{binary} -u suite --unittest-jobs 4"]
+
+
+def test_remove_files_clears_matching_tree(tmp_path: Path):
+    for rel in ["a.gcda", "sub/b.gcda", "sub/deep/c.gcda", "sub/keep.gcno"]:
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text("")
+
+    assert _remove_files(str(tmp_path), "*.gcda") == 3
+    assert [p.name for p in tmp_path.rglob("*.gc*")] == ["keep.gcno"]
+    assert _remove_files(str(tmp_path), "*.gcda") == 0
+    assert _remove_files(str(tmp_path / "missing"), "*.gcda") == 0
+
+
+def test_compile_test_hooks_command(tmp_path: Path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        run_tests, "run_command", lambda cmd, **kw: calls.append((cmd, kw["cwd"]))
+    )
+    test_file = tmp_path / "SetHook_test.cpp"
+    do_compile_test_hooks(test_file, ("a", "b"), hook_coverage=True, cwd="/x")
+    assert calls == [
+        (
+            [
+                "hookz",
+                "build-test-hooks",
+                str(test_file),
+                "--hooks-c-dir",
+                "a",
+                "--hooks-c-dir",
+                "b",
+                "--hook-coverage",
+            ],
+            "/x",
+        )
+    ]
+
+
+def test_run_rippled_parallel_runs(tmp_path: Path):
+    binary = tmp_path / "rippled"
+    # Fail only the second run; each run claims the next free slot.
+    binary.write_text(
+        "#!/bin/sh\n"
+        'd="$(dirname "$0")"\n'
+        'n=1; while ! mkdir "$d/slot$n" 2>/dev/null; do n=$((n+1)); done\n'
+        'echo "run $n"\n'
+        '[ "$n" = 2 ] && exit 3\n'
+        "exit 0\n"
+    )
+    binary.chmod(0o755)
+    tee = tmp_path / "tee.txt"
+    rc = run_rippled(
+        ["suite"],
+        use_lldb=False,
+        times=4,
+        stop_on_fail=False,
+        build_dir=str(tmp_path),
+        tee_file=tee,
+        parallel_runs=2,
+    )
+    assert rc == 3
+    assert sorted(p.name for p in tmp_path.glob("slot*")) == [
+        "slot1",
+        "slot2",
+        "slot3",
+        "slot4",
+    ]
+    out = tee.read_text()
+    assert out.count("=== Run ") == 4
+    assert "(exit code 3)" in out
+
+
+def test_run_rippled_parallel_runs_needs_no_stop_on_fail(tmp_path: Path):
+    _fake_rippled(tmp_path)
+    assert (
+        run_rippled(
+            ["suite"],
+            use_lldb=False,
+            times=2,
+            build_dir=str(tmp_path),
+            parallel_runs=2,
+        )
+        == 0
+    )
+    assert len((tmp_path / "calls").read_text().splitlines()) == 2
+
+
+def test_jshooks_header_capture_returns_output_whole(tmp_path: Path, monkeypatch):
+    tool = tmp_path / "build-jshooks-header"
+    tool.write_text('#!/bin/sh\necho "out $1"\necho "err" >&2\nexit "${RC:-0}"\n')
+    tool.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}:{os.environ['PATH']}")
+    tee = tmp_path / "tee.txt"
+
+    output = do_build_jshooks_header(tee_file=tee, cwd=str(tmp_path), capture=True)
+    assert output == b"out --canonical\nerr\n"
+    assert not tee.exists()  # the caller writes the block out
+
+    monkeypatch.setenv("RC", "2")
+    with pytest.raises(subprocess.CalledProcessError) as exc:
+        do_build_jshooks_header(cwd=str(tmp_path), capture=True)
+    assert exc.value.output == b"out --canonical\nerr\n"
+
+
+def test_write_step_outputs_writes_all_before_raising(tmp_path: Path, capfd):
+    failed: Future[bytes] = Future()
+    failed.set_exception(
+        subprocess.CalledProcessError(1, ["js"], output=b"js failed\n")
+    )
+    done: Future[bytes] = Future()
+    done.set_result(b"wasm ok\n")
+    tee = tmp_path / "tee.txt"
+
+    with pytest.raises(subprocess.CalledProcessError) as exc:
+        _write_step_outputs([failed, done], tee)
+    assert exc.value.cmd == ["js"]
+    assert capfd.readouterr().out == "js failed\nwasm ok\n"
+    assert tee.read_bytes() == b"js failed\nwasm ok\n"
@@ -1,2 +1,98 @@
+import subprocess
+
+import pytest
+
+from xahaud_scripts.utils import shell_utils
+from xahaud_scripts.utils.paths import get_xahaud_root
+from xahaud_scripts.utils.shell_utils import get_logical_cpu_count, run_command
+
+
 def tests_work():
     assert True
+
+
+@pytest.fixture
+def fresh_cpu_count():
+    get_logical_cpu_count.cache_clear()
+    yield
+    get_logical_cpu_count.cache_clear()
+
+
+def test_logical_cpu_count_honours_affinity(monkeypatch, fresh_cpu_count):
+    monkeypatch.setattr(shell_utils.sys, "platform", "linux")
+    monkeypatch.setattr(shell_utils.os, "process_cpu_count", lambda: 3)
+    monkeypatch.setattr(shell_utils.os, "cpu_count", lambda: 64)
+    assert get_logical_cpu_count() == 3
+
+
+def test_logical_cpu_count_defaults_to_four(monkeypatch, fresh_cpu_count):
+    monkeypatch.setattr(shell_utils.sys, "platform", "linux")
+    monkeypatch.setattr(shell_utils.os, "process_cpu_count", lambda: None)
+    assert get_logical_cpu_count() == 4
+
+
+def test_logical_cpu_count_is_cached(monkeypatch, fresh_cpu_count):
+    monkeypatch.setattr(shell_utils.sys, "platform", "linux")
+    monkeypatch.setattr(shell_utils.os, "process_cpu_count", lambda: 3)
+    assert get_logical_cpu_count() == 3
+    monkeypatch.setattr(shell_utils.os, "process_cpu_count", lambda: 5)
+    assert get_logical_cpu_count() == 3
+
+
+def test_get_xahaud_root_walks_up_once(tmp_path, monkeypatch):
+    (tmp_path / "CMakeLists.txt").write_text("")
+    (tmp_path / ".git").mkdir()
+    (tmp_path / "src" / "deep").mkdir(parents=True)
+    monkeypatch.delenv("XAHAUD_ROOT", raising=False)
+    monkeypatch.chdir(tmp_path / "src" / "deep")
+    assert get_xahaud_root() == str(tmp_path)
+
+    calls = []
+    monkeypatch.setattr(
+        "xahaud_scripts.utils.paths.os.path.exists", lambda p: calls.append(p)
+    )
+    assert get_xahaud_root() == str(tmp_path)
+    assert calls == []
+
+    monkeypatch.setenv("XAHAUD_ROOT", "/elsewhere")
+    assert get_xahaud_root() == "/elsewhere"
+
+
+def test_run_command_tees_output(tmp_path, capfd):
+    tee = tmp_path / "out" / "build.txt"
+    tee.parent.mkdir()
+    tee.write_bytes(b"earlier\n")
+    cmd = ["sh", "-c", "echo one; echo two >&2; printf 'caf\\303\\251\\n'"]
+    result = run_command(cmd, tee_file=tee)
+    assert result.returncode == 0
+    assert tee.read_text() == "earlier\none\ntwo\ncafé\n"
+    assert capfd.readouterr().out == "one\ntwo\ncafé\n"
+
+
+def test_run_command_tee_raises_on_failure(tmp_path):
+    with pytest.raises(subprocess.CalledProcessError):
+        run_command(["sh", "-c", "exit 3"], tee_file=tmp_path / "t.txt")
+    assert (
+        run_command(
+            ["sh", "-c", "exit 3"], check=False, tee_file=tmp_path / "t.txt"
+        ).returncode
+        == 3
+    )
+
+
+def test_check_tool_exists_is_cached(monkeypatch):
+    calls = []
+
+    def fake_which(name):
+        calls.append(name)
+        return f"/bin/{name}" if name == "ninja" else None
+
+    monkeypatch.setattr(shell_utils.shutil, "which", fake_which)
+    shell_utils.check_tool_exists.cache_clear()
+    try:
+        assert shell_utils.check_tool_exists("ninja")
+        assert shell_utils.check_tool_exists("ninja")
+        assert not shell_utils.check_tool_exists("lldb")
+        assert calls == ["ninja", "lldb"]
+    finally:
+        shell_utils.check_tool_exists.cache_clear()